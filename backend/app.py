@@ -1,58 +1,518 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Request, request, jsonify, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+import io
 import json
-from datetime import datetime
-from werkzeug.utils import secure_filename
+import functools
+import time
+import errno
+from stat import S_ISDIR
+import tempfile
+from werkzeug.utils import secure_filename, cached_property
+from werkzeug.wsgi import wrap_file
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 import shutil
 import zipfile
+import unicodedata
+import mimetypes
+import hashlib
 from pathlib import Path
+from urllib.parse import quote
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 可选：ISA-L（SIMD加速的deflate/CRC32实现），可用时替换zipfile的压缩后端
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+# 可选：orjson（Rust实现的JSON编码器），大目录列表时编码明显更快
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """使用orjson编码/解码JSON，响应体直接使用orjson生成的bytes"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default),
+                                        mimetype=self.mimetype)
+
+class UploadRequest(Request):
+    """上传的文件在解析表单时直接写入存储目录下的临时文件，保存时只需重命名"""
+
+    @cached_property
+    def upload_tmp_paths(self):
+        """本次请求创建的上传临时文件路径"""
+        return []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = tempfile.NamedTemporaryFile(dir=FILE_STORAGE_PATH, prefix=UPLOAD_TMP_PREFIX,
+                                             buffering=UPLOAD_CHUNK_SIZE, delete=False)
+        self.upload_tmp_paths.append(stream.name)
+        # 只有分段自带Content-Length时长度才是准确的；按整个请求的长度预分配会让文件末尾多出空字节
+        if content_length:
+            _preallocate(stream.fileno(), content_length)
+        return stream
 
 app = Flask(__name__)
+app.request_class = UploadRequest
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # 允许跨域请求
 
 # 文件存储路径
 FILE_STORAGE_PATH = '/root/project/zen_example/frontend/data'
 
+# 文件列表每页默认返回的条目数
+LIST_PAGE_SIZE = 500
+
+# 目录mtime距现在不足此时长（纳秒）时不缓存列表也不发送ETag：
+# 同一个文件系统时间戳刻度内的两次修改不会改变mtime，此时的mtime不能代表目录内容
+LIST_MTIME_SETTLE_NS = 1_000_000_000
+
+# 修改时间字符串缓存的最大条目数，超出后整体清空
+MTIME_CACHE_SIZE = 10000
+
+# 上传写入的分块大小（1 MiB）
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# copy_file_range每次调用复制的最大字节数
+COPY_CHUNK_SIZE = 64 << 20
+
+# 上传过程中临时文件的前缀，文件列表中不显示
+UPLOAD_TMP_PREFIX = '.upload-'
+
+# 临时文件创建时权限为0600，重命名前按umask恢复为普通文件权限
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# 单文件下载时file_wrapper每次读取的块大小（服务器不支持sendfile时生效）
+DOWNLOAD_BLOCK_SIZE = 1 << 20
+
+# 部署在nginx之后时，设置为nginx中internal location的前缀（如/protected/），
+# 由nginx通过sendfile直接发送文件
+DOWNLOAD_ACCEL_REDIRECT = os.environ.get('DOWNLOAD_ACCEL_REDIRECT', '')
+
+# 文件夹打包下载时每次读取/输出的块大小
+ZIP_CHUNK_SIZE = 1 << 20
+
+# 打包下载的压缩级别：瓶颈在网络而不是压缩率，使用最快的一档
+ZIP_COMPRESS_LEVEL = 1
+
+# 打包时不超过该大小的文件由线程池预读，最多同时预读ZIP_PREFETCH_DEPTH个，每个下载最多缓冲约8 MiB。
+# 部署假设：生产环境为gunicorn gevent worker（见gunicorn.conf.py），threading已被monkey patch，
+# 标准线程池中的"线程"实际是协程，阻塞的文件读取会卡住整个worker；此时预读改用gevent hub的真实线程池。
+# 不使用gevent时（本地开发的threaded模式）使用ZIP_PREFETCH_WORKERS个线程的标准线程池
+ZIP_PREFETCH_SIZE = 1 << 20
+ZIP_PREFETCH_DEPTH = 8
+ZIP_PREFETCH_WORKERS = 4
+
 # 确保存储目录存在
 os.makedirs(FILE_STORAGE_PATH, exist_ok=True)
 
+# secure_filename对相同输入的结果是确定的，缓存重复出现的文件名
+_secure_filename = functools.lru_cache(maxsize=4096)(secure_filename)
+
+if isal_zlib is not None:
+    _zlib_get_compressor = zipfile._get_compressor
+
+    def _isal_get_compressor(compress_type, compresslevel=None):
+        """ZIP_DEFLATED使用ISA-L压缩，其余压缩方式仍走标准库"""
+        if compress_type == zipfile.ZIP_DEFLATED:
+            if compresslevel is None:
+                compresslevel = isal_zlib.ISAL_DEFAULT_COMPRESSION
+            level = min(compresslevel, isal_zlib.ISAL_BEST_COMPRESSION)
+            return isal_zlib.compressobj(level, isal_zlib.DEFLATED, -15)
+        return _zlib_get_compressor(compress_type, compresslevel)
+
+    zipfile._get_compressor = _isal_get_compressor
+    zipfile.crc32 = isal_zlib.crc32
+
+class ChunkedZipStream:
+    """供ZipFile写入的只追加缓冲区，由生成器取走已写出的数据"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        """取出并清空当前缓冲的数据"""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+def _set_attachment(response, filename):
+    """设置下载文件名，非ASCII文件名按RFC 5987编码（与send_file一致）"""
+    try:
+        filename.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        response.headers.set('Content-Disposition', 'attachment', filename=simple,
+                             **{'filename*': f"UTF-8''{quote(filename, safe='!#$&+^`|~')}"})
+    else:
+        response.headers.set('Content-Disposition', 'attachment', filename=filename)
+
+def _send_single_file(file_path, relative_path):
+    """发送单个文件，交给WSGI服务器的file_wrapper（gunicorn下为sendfile零拷贝）"""
+    filename = os.path.basename(file_path)
+    
+    if DOWNLOAD_ACCEL_REDIRECT:
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = DOWNLOAD_ACCEL_REDIRECT + quote(relative_path)
+        _set_attachment(response, filename)
+        return response
+    
+    stat = os.stat(file_path)
+    etag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}-{stat.st_ino:x}"
+    
+    # 内容未变化时直接返回304，不需要打开文件
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.last_modified = stat.st_mtime
+        response.cache_control.no_cache = True
+        return response
+    
+    file = open(file_path, 'rb')
+    response = Response(wrap_file(request.environ, file, DOWNLOAD_BLOCK_SIZE),
+                        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                        direct_passthrough=True)
+    response.content_length = stat.st_size
+    response.last_modified = stat.st_mtime
+    response.cache_control.no_cache = True
+    response.set_etag(etag)
+    _set_attachment(response, filename)
+    
+    try:
+        response.make_conditional(request.environ, accept_ranges=True, complete_length=stat.st_size)
+    except RequestedRangeNotSatisfiable:
+        file.close()
+        response = jsonify({'error': '请求的范围无效'})
+        response.status_code = 416
+        response.headers['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    
+    if response.status_code == 206:
+        # Range请求：定位到起点后交给服务器的file_wrapper，发送长度由Content-Length限定
+        start = response.content_range.start
+        length = response.content_range.stop - start
+        file_wrapper = request.environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None:
+            file.seek(start)
+            response.response = file_wrapper(file, DOWNLOAD_BLOCK_SIZE)
+        else:
+            response.response = _iter_file_range(file, start, length)
+    return response
+
+def _iter_file_range(file, start, length):
+    """按块读取文件中[start, start + length)区间的数据"""
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(DOWNLOAD_BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+def _iter_folder_files(folder_path):
+    """用os.scandir遍历文件夹，产出(DirEntry, 压缩包内路径)
+
+    与os.walk一致，不进入指向目录的符号链接；目录项类型来自getdents，遍历本身不需要stat
+    """
+    stack = [(folder_path, '')]
+    while stack:
+        dir_path, prefix = stack.pop()
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                arcname = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, arcname + '/'))
+                elif entry.is_file():
+                    yield entry, arcname
+
+def _zipinfo_from_stat(arcname, st):
+    """按ZipInfo.from_file的规则用已有的stat结果构造ZipInfo，避免再stat一次"""
+    date_time = time.localtime(st.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    return zinfo
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _gevent_threadpool():
+    """threading已被gevent monkey patch时返回gevent hub的线程池（真实的系统线程），否则返回None"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return None
+    if not monkey.is_module_patched('threading'):
+        return None
+    import gevent
+    return gevent.get_hub().threadpool
+
+def _iter_zip_folder(folder_path):
+    """边压缩边输出文件夹的zip数据，不在磁盘上生成临时文件
+
+    zip成员只能按顺序写入，压缩在当前线程进行；小文件由线程池提前读入内存，
+    读盘与压缩重叠，大文件仍按块流式读取
+    """
+    stream = ChunkedZipStream()
+    gevent_pool = _gevent_threadpool()
+    executor = None
+    if gevent_pool is None:
+        executor = ThreadPoolExecutor(max_workers=ZIP_PREFETCH_WORKERS)
+
+    def prefetch(path):
+        """提交预读，返回取得文件内容的函数"""
+        if gevent_pool is not None:
+            return gevent_pool.spawn(_read_file, path).get
+        return executor.submit(_read_file, path).result
+
+    try:
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESS_LEVEL) as zipf:
+            yield from _write_zip_members(zipf, stream, folder_path, prefetch)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    # 写出中央目录
+    data = stream.take()
+    if data:
+        yield data
+
+def _write_zip_members(zipf, stream, folder_path, prefetch):
+    """按顺序写入文件夹中的所有成员，每写完一块输出已压缩的数据"""
+    pending = deque()
+
+    def write_member(path, zinfo, result):
+        zinfo.compress_type = zipf.compression
+        zinfo._compresslevel = zipf.compresslevel  # 与ZipFile.write()保持一致
+        with zipf.open(zinfo, 'w') as dest:
+            if result is not None:
+                dest.write(result())
+            else:
+                with open(path, 'rb') as src:
+                    while True:
+                        chunk = src.read(ZIP_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        data = stream.take()
+                        if data:
+                            yield data
+        data = stream.take()
+        if data:
+            yield data
+
+    for entry, arcname in _iter_folder_files(folder_path):
+        zinfo = _zipinfo_from_stat(arcname, entry.stat())
+        result = None
+        if zinfo.file_size <= ZIP_PREFETCH_SIZE:
+            result = prefetch(entry.path)
+        pending.append((entry.path, zinfo, result))
+        if len(pending) > ZIP_PREFETCH_DEPTH:
+            yield from write_member(*pending.popleft())
+    while pending:
+        yield from write_member(*pending.popleft())
+
+def _move_upload(file, file_path):
+    """上传内容已在存储目录的临时文件中时直接重命名到目标路径，成功返回True"""
+    stream = file.stream
+    if getattr(stream, 'name', None) not in request.upload_tmp_paths:
+        return False
+    stream.flush()
+    try:
+        os.chmod(stream.name, 0o666 & ~_UMASK)
+        os.replace(stream.name, file_path)
+    except OSError:
+        # 目标目录在其他文件系统上，无法重命名
+        return False
+    return True
+
+def _copy_in_kernel(stream, out_fd):
+    """源是真实文件时用copy_file_range在内核中复制，数据不经过用户态；不支持时返回False"""
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    try:
+        in_fd = stream.fileno()
+        offset = stream.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    start = offset
+    while True:
+        try:
+            copied = os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE, offset_src=offset)
+        except OSError as e:
+            # 跨文件系统、文件系统或内核不支持时退回普通读写，只要还未复制任何数据
+            if offset == start and e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                return False
+            raise
+        if not copied:
+            return True
+        offset += copied
+
+def _preallocate(fd, length):
+    """写入前一次性分配磁盘空间，ext4/xfs可以分配连续的extent，写入时不再更新元数据"""
+    if not hasattr(os, 'posix_fallocate'):
+        return
+    try:
+        os.posix_fallocate(fd, 0, length)
+    except OSError:
+        # 文件系统不支持时直接写入即可
+        pass
+
+def _remaining_size(stream):
+    """源是真实文件时返回从当前位置到末尾的字节数，否则返回None"""
+    try:
+        return os.fstat(stream.fileno()).st_size - stream.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+def _save_stream(stream, file_path):
+    """按固定大小分块把上传流写入目标文件，内存占用与文件大小无关"""
+    with open(file_path, 'wb', buffering=0) as raw:
+        size = _remaining_size(stream)
+        if size:
+            _preallocate(raw.fileno(), size)
+        if not _copy_in_kernel(stream, raw.fileno()):
+            out = io.BufferedWriter(raw, buffer_size=UPLOAD_CHUNK_SIZE)
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+            out.flush()
+        # 一次性的大文件上传不需要留在页缓存中
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+_mtime_strings = {}
+
+def _format_mtime(ts):
+    """把修改时间格式化为本地时间的ISO字符串（精确到秒），同一秒内修改的文件共用同一个字符串"""
+    key = int(ts)
+    text = _mtime_strings.get(key)
+    if text is None:
+        if len(_mtime_strings) >= MTIME_CACHE_SIZE:
+            _mtime_strings.clear()
+        text = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(key))
+        _mtime_strings[key] = text
+    return text
+
+@functools.lru_cache(maxsize=1024)
+def _list_directory(full_path, path, offset, limit, mtime_ns):
+    """列出目录的一页内容，返回JSON响应体
+
+    目录的mtime_ns参与缓存键：目录中有条目增删或重命名时mtime会变化，
+    此时重新扫描；否则直接复用上次生成的响应体。
+    list_files只对mtime已稳定（距今超过LIST_MTIME_SETTLE_NS）的目录使用缓存，
+    避免同一时间戳刻度内的连续修改被同一个mtime掩盖。
+    注意：原地覆盖写已有文件不会改变目录mtime，这种情况下缓存（以及list_files
+    返回的304）中的size和modified可能是旧值，直到目录本身发生变化。
+    """
+    files = []
+    next_offset = None
+    skipped = 0
+    
+    # os.scandir一次读取目录项及其类型，每个条目只需一次stat
+    with os.scandir(full_path) as it:
+        for entry in it:
+            if entry.name.startswith(UPLOAD_TMP_PREFIX):
+                continue
+            if entry.is_file():
+                item_type = 'file'
+            elif entry.is_dir():
+                item_type = 'folder'
+            else:
+                continue
+            
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(files) >= limit:
+                next_offset = offset + limit
+                break
+            
+            stat = entry.stat()
+            files.append({
+                'name': entry.name,
+                'type': item_type,
+                'size': stat.st_size if item_type == 'file' else 0,
+                'modified': _format_mtime(stat.st_mtime),
+                'path': os.path.join(path, entry.name) if path else entry.name
+            })
+    
+    return app.json.response({'files': files, 'next_offset': next_offset}).get_data()
+
+@app.teardown_request
+def remove_upload_tmp_files(exc):
+    """清理未被重命名的上传临时文件（请求失败或中断时）"""
+    for tmp_path in request.upload_tmp_paths:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
 @app.route('/api/files', methods=['GET'])
 def list_files():
     """获取文件列表"""
     try:
         path = request.args.get('path', '')
+        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit', LIST_PAGE_SIZE, type=int)
         full_path = os.path.join(FILE_STORAGE_PATH, path) if path else FILE_STORAGE_PATH
         
-        if not os.path.exists(full_path):
-            return jsonify({'error': '路径不存在'}), 404
-            
-        files = []
+        if offset < 0 or limit <= 0:
+            return jsonify({'error': '分页参数无效'}), 400
         
-        for item in os.listdir(full_path):
-            item_path = os.path.join(full_path, item)
-            relative_path = os.path.join(path, item) if path else item
+        try:
+            mtime_ns = os.stat(full_path).st_mtime_ns
+        except FileNotFoundError:
+            return jsonify({'error': '路径不存在'}), 404
             
-            if os.path.isfile(item_path):
-                stat = os.stat(item_path)
-                files.append({
-                    'name': item,
-                    'type': 'file',
-                    'size': stat.st_size,
-                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'path': relative_path
-                })
-            elif os.path.isdir(item_path):
-                stat = os.stat(item_path)
-                files.append({
-                    'name': item,
-                    'type': 'folder',
-                    'size': 0,
-                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'path': relative_path
-                })
+        # 目录刚修改过时mtime可能还会在同一刻度内再次变化，直接扫描，不缓存也不发送ETag
+        if time.time_ns() - mtime_ns < LIST_MTIME_SETTLE_NS:
+            body = _list_directory.__wrapped__(full_path, path, offset, limit, mtime_ns)
+            response = Response(body, mimetype=app.json.mimetype)
+            response.cache_control.no_cache = True
+            return response
         
-        return jsonify({'files': files})
+        # 列表内容随目录mtime和分页参数变化，客户端轮询时未变化的页只返回304
+        # 与_list_directory的缓存一样，原地覆盖写文件不会改变目录mtime
+        etag = hashlib.blake2b(f'{full_path}:{mtime_ns}:{offset}:{limit}'.encode(), digest_size=16).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            body = _list_directory(full_path, path, offset, limit, mtime_ns)
+            response = Response(body, mimetype=app.json.mimetype)
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -69,13 +529,16 @@ def upload_file():
         if file.filename == '':
             return jsonify({'error': '没有选择文件'}), 400
             
-        filename = secure_filename(file.filename)
+        filename = _secure_filename(file.filename)
         upload_path = os.path.join(FILE_STORAGE_PATH, path) if path else FILE_STORAGE_PATH
         
         os.makedirs(upload_path, exist_ok=True)
         file_path = os.path.join(upload_path, filename)
         
-        file.save(file_path)
+        if not _move_upload(file, file_path):
+            _save_stream(file.stream, file_path)
+            # 覆盖同名文件不会改变目录mtime，手动更新以使文件列表缓存失效
+            os.utime(upload_path)
         
         return jsonify({'message': '文件上传成功', 'filename': filename})
     except Exception as e:
@@ -92,7 +555,7 @@ def create_folder():
         if not folder_name:
             return jsonify({'error': '文件夹名称不能为空'}), 400
             
-        folder_name = secure_filename(folder_name)
+        folder_name = _secure_filename(folder_name)
         base_path = os.path.join(FILE_STORAGE_PATH, path) if path else FILE_STORAGE_PATH
         folder_path = os.path.join(base_path, folder_name)
         
@@ -115,20 +578,14 @@ def download_file(filename):
             return jsonify({'error': '文件不存在'}), 404
             
         if os.path.isfile(file_path):
-            return send_file(file_path, as_attachment=True)
+            return _send_single_file(file_path, filename)
         else:
-            # 如果是文件夹，创建zip文件
-            zip_filename = f"{os.path.basename(filename)}.zip"
-            zip_path = f"/tmp/{zip_filename}"
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(file_path):
-                    for file in files:
-                        file_path_in_zip = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path_in_zip, file_path)
-                        zipf.write(file_path_in_zip, arcname)
-            
-            return send_file(zip_path, as_attachment=True, download_name=zip_filename)
+            # 如果是文件夹，流式生成zip文件
+            zip_filename = f"{os.path.basename(filename.rstrip('/'))}.zip"
+            response = Response(stream_with_context(_iter_zip_folder(file_path)),
+                                mimetype='application/zip')
+            _set_attachment(response, zip_filename)
+            return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -144,17 +601,22 @@ def delete_item():
             
         full_path = os.path.join(FILE_STORAGE_PATH, item_path)
         
-        if not os.path.exists(full_path):
+        # 只lstat一次：符号链接（包括指向目录的）只删除链接本身
+        try:
+            st = os.lstat(full_path)
+        except FileNotFoundError:
             return jsonify({'error': '文件或文件夹不存在'}), 404
             
-        if os.path.isfile(full_path):
-            os.remove(full_path)
-        else:
+        if S_ISDIR(st.st_mode):
+            # Linux上rmtree基于目录fd做scandir和unlinkat/rmdir(dir_fd=)，不会逐项解析完整路径
             shutil.rmtree(full_path)
+        else:
+            os.unlink(full_path)
             
         return jsonify({'message': '删除成功'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # 仅用于本地开发，生产环境请使用: gunicorn -c gunicorn.conf.py wsgi:app
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
\ No newline at end of file
@@ -0,0 +1,12 @@
+# gunicorn配置：使用gevent worker以协程并发处理请求
+# gevent只让socket I/O变为协作式，磁盘读写（上传落盘、复制、打包读文件）仍会阻塞整个worker进程
+# gevent worker会在导入应用前完成monkey patch，app.py中不需要再调用patch_all()
+import multiprocessing
+
+bind = '0.0.0.0:5000'
+worker_class = 'gevent'
+# 磁盘I/O阻塞期间该进程内所有协程都会停顿，多开进程分摊阻塞
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_connections = 1000
+# 大文件上传/下载可能持续较长时间
+timeout = 300
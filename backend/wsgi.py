@@ -0,0 +1,9 @@
+"""WSGI入口
+
+生产环境使用gunicorn + gevent worker启动：
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import app
+
+__all__ = ['app']
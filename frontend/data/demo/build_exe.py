@@ -7,11 +7,60 @@ PDF处理工具打包脚本
 
 import os
 import sys
+import json
+import argparse
 import subprocess
 import shutil
+import importlib.util
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-def check_and_install_package(package_name, import_name=None, pip_name=None, optional=False):
+# 依赖检查结果缓存：记录检查通过的包的入口文件及其mtime，未变化时跳过导入
+DEPS_CACHE_FILE = Path.home() / '.cache' / 'zen_example' / 'deps_ok.json'
+
+# 程序用不到、但会被依赖分析带进来的模块，打包时排除以减小可执行文件
+EXCLUDED_MODULES = [
+    'onnxruntime.training',
+    'onnxruntime.quantization',
+    'matplotlib',
+    'pandas',
+    'scipy',
+    'IPython',
+]
+
+# 是否实例化RapidOCR检查DLL依赖（需要加载ONNX模型，耗时数秒），由--verify-dll开启
+VERIFY_DLL = False
+
+def _load_deps_cache():
+    """读取依赖检查缓存，文件不存在或损坏时返回空字典"""
+    try:
+        with open(DEPS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_deps_cache():
+    """保存依赖检查缓存，写入失败不影响构建"""
+    try:
+        DEPS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(DEPS_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_deps_cache, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠ 无法写入依赖检查缓存: {e}")
+
+def _package_stamp(import_name):
+    """不导入包，只定位其入口文件，返回[路径, mtime_ns]；找不到时返回None"""
+    try:
+        spec = importlib.util.find_spec(import_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return [spec.origin, os.stat(spec.origin).st_mtime_ns]
+
+_deps_cache = _load_deps_cache()
+
+def check_and_install_package(package_name, import_name=None, pip_name=None, optional=False, install=True):
     """检查并安装单个包
     
     Args:
@@ -19,23 +68,36 @@ def check_and_install_package(package_name, import_name=None, pip_name=None, opt
         import_name: 导入时使用的名称，默认与package_name相同
         pip_name: pip安装时使用的名称，默认与package_name相同
         optional: 是否为可选包，可选包安装失败不会导致整体失败
+        install: 未安装时是否调用pip安装
     
     Returns:
-        bool: 安装成功返回True，失败返回False
+        bool: 安装成功返回True，失败返回False；install为False且未安装时返回None
     """
     if import_name is None:
         import_name = package_name
     if pip_name is None:
         pip_name = package_name
     
+    # 上次检查通过且包文件未变化时直接跳过（--verify-dll时RapidOCR总是重新检查）
+    stamp = _package_stamp(import_name)
+    if stamp is not None and _deps_cache.get(import_name) == stamp:
+        if not (VERIFY_DLL and import_name == 'rapidocr_onnxruntime'):
+            print(f"✓ {package_name} 已安装（缓存）")
+            return True
+    
     try:
         # 特殊处理RapidOCR，因为它可能有DLL依赖问题
         if import_name == 'rapidocr_onnxruntime':
             try:
                 from rapidocr_onnxruntime import RapidOCR
-                # 尝试实例化以检查DLL是否正常
-                ocr = RapidOCR()
-                print(f"✓ {package_name} 已安装且可正常使用")
+                if VERIFY_DLL:
+                    # 尝试实例化以检查DLL是否正常
+                    ocr = RapidOCR()
+                    print(f"✓ {package_name} 已安装且可正常使用")
+                else:
+                    print(f"✓ {package_name} 已安装（使用--verify-dll检查DLL依赖）")
+                if stamp is not None:
+                    _deps_cache[import_name] = stamp
                 return True
             except Exception as e:
                 if "DLL load failed" in str(e) or "onnxruntime" in str(e):
@@ -50,8 +112,12 @@ def check_and_install_package(package_name, import_name=None, pip_name=None, opt
             __import__(import_name)
         
         print(f"✓ {package_name} 已安装")
+        if stamp is not None:
+            _deps_cache[import_name] = stamp
         return True
     except ImportError:
+        if not install:
+            return None
         print(f"× {package_name} 未安装，正在安装...")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name])
@@ -84,52 +150,37 @@ def check_system_dependencies():
     # 检查Visual C++ Redistributable (Windows)
     if sys.platform.startswith('win'):
         print("检查Microsoft Visual C++ Redistributable...")
+        # 检查常见的VC++ Redistributable注册表项
+        vc_versions = [
+            "Microsoft Visual C++ 2015-2022 Redistributable (x64)",
+            "Microsoft Visual C++ 2019 Redistributable (x64)",
+            "Microsoft Visual C++ 2017 Redistributable (x64)",
+            "Microsoft Visual C++ 2015 Redistributable (x64)"
+        ]
+        
+        # 一次PowerShell查询取出所有VC++运行库的显示名称，不必在Python中逐个打开Uninstall下的子项
+        query = ("Get-ItemProperty 'HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\*' | "
+                 "Where-Object DisplayName -like 'Microsoft Visual C++*' | "
+                 "Select-Object -ExpandProperty DisplayName")
+        
+        found_vc = False
         try:
-            import winreg
-            # 检查常见的VC++ Redistributable注册表项
-            vc_versions = [
-                "Microsoft Visual C++ 2015-2022 Redistributable (x64)",
-                "Microsoft Visual C++ 2019 Redistributable (x64)",
-                "Microsoft Visual C++ 2017 Redistributable (x64)",
-                "Microsoft Visual C++ 2015 Redistributable (x64)"
-            ]
-            
-            found_vc = False
-            try:
-                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                   r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-                i = 0
-                while True:
-                    try:
-                        subkey_name = winreg.EnumKey(key, i)
-                        subkey = winreg.OpenKey(key, subkey_name)
-                        try:
-                            display_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                            for vc_version in vc_versions:
-                                if vc_version in display_name:
-                                    print(f"✓ 找到: {display_name}")
-                                    found_vc = True
-                                    break
-                        except FileNotFoundError:
-                            pass
-                        winreg.CloseKey(subkey)
-                        i += 1
-                    except OSError:
-                        break
-                winreg.CloseKey(key)
-            except Exception as e:
-                print(f"检查注册表时出错: {e}")
-            
-            if not found_vc:
-                print("⚠ 警告: 未找到Microsoft Visual C++ Redistributable")
-                print("  这可能导致onnxruntime DLL加载失败")
-                print("  建议下载安装: https://aka.ms/vs/17/release/vc_redist.x64.exe")
-                return False
-            else:
-                print("✓ Microsoft Visual C++ Redistributable 已安装")
-                
-        except ImportError:
-            print("⚠ 无法检查Visual C++ Redistributable (winreg模块不可用)")
+            result = subprocess.run(['powershell', '-NoProfile', '-NonInteractive', '-Command', query],
+                                    capture_output=True, text=True, timeout=60)
+            for display_name in result.stdout.splitlines():
+                if any(vc_version in display_name for vc_version in vc_versions):
+                    print(f"✓ 找到: {display_name.strip()}")
+                    found_vc = True
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"检查注册表时出错: {e}")
+        
+        if not found_vc:
+            print("⚠ 警告: 未找到Microsoft Visual C++ Redistributable")
+            print("  这可能导致onnxruntime DLL加载失败")
+            print("  建议下载安装: https://aka.ms/vs/17/release/vc_redist.x64.exe")
+            return False
+        else:
+            print("✓ Microsoft Visual C++ Redistributable 已安装")
     
     # 检查其他系统依赖
     print("检查其他系统库...")
@@ -184,10 +235,15 @@ def check_required_packages():
     
     failed_packages = []
     
-    # 检查必需包
-    for display_name, import_name, pip_name, is_optional in required_packages:
-        if not check_and_install_package(display_name, import_name, pip_name, is_optional):
-            failed_packages.append(display_name)
+    # 检查必需包：各包的导入互不依赖，并行检查；pip安装会修改环境，未安装的包再串行安装
+    with ThreadPoolExecutor(max_workers=len(required_packages)) as executor:
+        results = list(executor.map(lambda package: check_and_install_package(*package, install=False),
+                                    required_packages))
+    for package, result in zip(required_packages, results):
+        if result is None:
+            result = check_and_install_package(*package)
+        if not result:
+            failed_packages.append(package[0])
     
     # 检查OCR引擎
     print("\n检查OCR引擎...")
@@ -220,6 +276,8 @@ def check_required_packages():
             else:
                 print(f"⚠ {display_name} 不可用（通常系统自带，可能需要重新安装Python）")
     
+    _save_deps_cache()
+    
     if failed_packages:
         print(f"\n❌ 以下关键包安装失败: {', '.join(failed_packages)}")
         print("请手动安装这些包后重试")
@@ -256,6 +314,9 @@ def create_spec_file():
         rapidocr_path = ""
         rapidocr_models_path = ""
     
+    # Windows上的strip会破坏DLL，只在Linux/macOS上去除符号表
+    strip = not sys.platform.startswith('win')
+    
     spec_content = f'''# -*- mode: python ; coding: utf-8 -*-
 import os
 import sys
@@ -320,7 +381,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={{}},
     runtime_hooks=[],
-    excludes=[],
+    excludes={EXCLUDED_MODULES!r},
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -339,7 +400,7 @@ exe = EXE(
     name='PDF处理工具',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
+    strip={strip},
     upx=True,
     upx_exclude=[],
     runtime_tmpdir=None,
@@ -429,12 +490,15 @@ def create_simple_build():
         "--hidden-import=onnxruntime.capi",
         "--hidden-import=onnxruntime.capi.onnxruntime_pybind11_state",
         "--hidden-import=onnxruntime.backend",
-        "--collect-all=onnxruntime",  # 收集所有onnxruntime相关文件
+        "--collect-binaries=onnxruntime",  # 只收集onnxruntime的动态库，不带源码和测试文件
         "--collect-all=rapidocr_onnxruntime",  # 收集所有rapidocr相关文件
         "--collect-data=onnxruntime",  # 收集onnxruntime数据文件
         "--collect-data=rapidocr_onnxruntime",  # 收集rapidocr数据文件
+    ] + [f"--exclude-module={module}" for module in EXCLUDED_MODULES] + [
         "pdf_processor_complete.py"
     ]
+    if not sys.platform.startswith('win'):
+        cmd.insert(-1, "--strip")  # 去除动态库的符号表
     
     try:
         print(f"执行命令: {' '.join(cmd)}")
@@ -457,6 +521,14 @@ def create_simple_build():
 
 def main():
     """主函数"""
+    global VERIFY_DLL
+    
+    parser = argparse.ArgumentParser(description='PDF处理工具打包脚本')
+    parser.add_argument('--verify-dll', action='store_true',
+                        help='实例化RapidOCR检查onnxruntime DLL依赖（较慢）')
+    args = parser.parse_args()
+    VERIFY_DLL = args.verify_dll
+    
     print("=" * 50)
     print("PDF处理工具 - Windows可执行程序打包脚本")
     print("=" * 50)
@@ -13,9 +13,30 @@ import subprocess
 import platform
 import argparse
 import zipfile
+import hashlib
 from pathlib import Path
 from datetime import datetime
 
+# 已经压缩过的文件类型，打包时直接存储不再压缩
+STORED_SUFFIXES = {'.exe', '.zip', '.7z', '.gz', '.onnx', '.png', '.jpg', '.jpeg'}
+
+# Linux ioctl FICLONE（linux/fs.h），在btrfs/xfs等文件系统上创建共享数据块的副本
+FICLONE = 0x40049409
+
+
+def _fast_copy(src, dst):
+    """复制文件：Linux上先尝试reflink，不复制数据块；不支持时退回shutil.copy2"""
+    if sys.platform.startswith('linux'):
+        try:
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
 
 class PDFProcessorBuilder:
     """PDF处理器打包构建器"""
@@ -33,6 +54,13 @@ class PDFProcessorBuilder:
         self.build_dir = self.project_dir / "build"
         self.dist_dir = self.project_dir / "dist"
         self.packages_dir = self.project_dir / "packages"
+        # 记录上次成功安装的依赖清单哈希；放在项目目录下，清理build时不会被删除
+        self.deps_marker = self.project_dir / '.deps.sha256'
+        # PyInstaller的缓存目录固定在项目下，增量构建时可以复用
+        self.pyinstaller_cache_dir = self.project_dir / '.pyi_cache'
+        
+        # 构建时间：包名和README使用同一个时间
+        self.build_time = datetime.now()
         
         # 平台信息
         self.platform = platform.system().lower()
@@ -58,12 +86,11 @@ class PDFProcessorBuilder:
             raise RuntimeError(f"需要Python 3.8+，当前版本: {python_version.major}.{python_version.minor}")
         print(f"✓ Python版本: {python_version.major}.{python_version.minor}.{python_version.micro}")
         
-        # 检查PyInstaller
+        # 检查PyInstaller：直接读取当前解释器中的版本，不再启动子进程
         try:
-            result = subprocess.run(['pyinstaller', '--version'], 
-                                  capture_output=True, text=True, check=True)
-            print(f"✓ PyInstaller版本: {result.stdout.strip()}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+            import PyInstaller
+            print(f"✓ PyInstaller版本: {PyInstaller.__version__}")
+        except ImportError:
             raise RuntimeError("PyInstaller未安装或不可用")
     
     def install_dependencies(self, force=False):
@@ -74,7 +101,17 @@ class PDFProcessorBuilder:
         """
         print("\n=== 安装依赖包 ===")
         
-        cmd = [sys.executable, '-m', 'pip', 'install', '-r', str(self.requirements_file)]
+        # 依赖清单和解释器都未变化时，上次的安装结果仍然有效，跳过pip
+        digest = hashlib.sha256(self.requirements_file.read_bytes())
+        digest.update(sys.executable.encode())
+        digest = digest.hexdigest()
+        if not force and self.deps_marker.exists() and self.deps_marker.read_text().strip() == digest:
+            print("✓ 依赖包未变化，跳过安装")
+            return
+        
+        cmd = [sys.executable, '-m', 'pip', 'install',
+               '--cache-dir', str(Path.home() / '.cache' / 'pip'),
+               '-r', str(self.requirements_file)]
         if force:
             cmd.append('--force-reinstall')
         
@@ -83,6 +120,8 @@ class PDFProcessorBuilder:
             print("✓ 依赖包安装完成")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"依赖包安装失败: {e}")
+        
+        self.deps_marker.write_text(digest)
     
     def clean_build_dirs(self):
         """清理构建目录"""
@@ -94,48 +133,49 @@ class PDFProcessorBuilder:
                 shutil.rmtree(dir_path)
                 print(f"✓ 清理目录: {dir_path}")
         
-        # 清理__pycache__
-        for pycache in self.project_dir.rglob('__pycache__'):
-            if pycache.is_dir():
+        # 清理__pycache__：os.walk基于scandir，不对每个文件stat；找到的缓存目录从遍历中剔除，不再进入
+        for root, dirs, _ in os.walk(self.project_dir):
+            if '__pycache__' in dirs:
+                dirs.remove('__pycache__')
+                pycache = Path(root) / '__pycache__'
                 shutil.rmtree(pycache)
                 print(f"✓ 清理缓存: {pycache}")
     
-    def build_executable(self, debug=False):
+    def build_executable(self, debug=False, full_rebuild=False):
         """构建可执行文件
         
         Args:
             debug: 是否启用调试模式
+            full_rebuild: 是否清空PyInstaller缓存完整重建
         """
         print("\n=== 构建可执行文件 ===")
         
         # 构建命令
-        cmd = ['pyinstaller', '--clean']
+        # 使用当前解释器中的PyInstaller，与前提检查的是同一个安装
+        cmd = [sys.executable, '-m', 'PyInstaller', '--noconfirm']
+        
+        # 默认增量构建：复用build目录中的分析结果和PyInstaller缓存中已处理的二进制文件
+        if full_rebuild:
+            cmd.append('--clean')
+        
+        # 逐个模块的INFO日志在依赖图较大时本身就有可观的开销
+        if not debug:
+            cmd.append('--log-level=WARN')
         
         if debug:
             cmd.append('--debug=all')
         
         cmd.append(str(self.spec_file))
         
-        # 执行构建
-        try:
-            print(f"执行命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, cwd=self.project_dir, check=True, 
-                                  capture_output=True, text=True)
-            print("✓ 构建完成")
-            
-            if result.stdout:
-                print("构建输出:")
-                print(result.stdout)
-                
-        except subprocess.CalledProcessError as e:
-            print(f"构建失败: {e}")
-            if e.stdout:
-                print("标准输出:")
-                print(e.stdout)
-            if e.stderr:
-                print("错误输出:")
-                print(e.stderr)
-            raise
+        # 执行构建：子进程直接继承控制台输出，不经过Python读取和解码
+        print(f"执行命令: {' '.join(cmd)}", flush=True)
+        env = dict(os.environ, PYINSTALLER_CONFIG_DIR=str(self.pyinstaller_cache_dir))
+        result = subprocess.run(cmd, cwd=self.project_dir, env=env)
+        
+        if result.returncode != 0:
+            print(f"构建失败，退出代码: {result.returncode}")
+            raise subprocess.CalledProcessError(result.returncode, cmd)
+        print("✓ 构建完成")
     
     def create_distribution_package(self):
         """创建分发包"""
@@ -151,13 +191,13 @@ class PDFProcessorBuilder:
             raise FileNotFoundError(f"可执行文件不存在: {exe_path}")
         
         # 创建分发目录
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = self.build_time.strftime('%Y%m%d_%H%M%S')
         package_name = f'pdf_processor_{self.platform}_{self.arch}_{timestamp}'
         package_dir = self.project_dir / 'packages' / package_name
         package_dir.mkdir(parents=True, exist_ok=True)
         
         # 复制可执行文件
-        shutil.copy2(exe_path, package_dir / exe_name)
+        _fast_copy(exe_path, package_dir / exe_name)
         print(f"✓ 复制可执行文件: {exe_name}")
         
         # 创建使用说明
@@ -174,7 +214,15 @@ class PDFProcessorBuilder:
         
         # 创建压缩包
         archive_path = self.project_dir / 'packages' / f'{package_name}.zip'
-        shutil.make_archive(str(archive_path.with_suffix('')), 'zip', package_dir)
+        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, strict_timestamps=False) as zipf:
+            for file_path in sorted(package_dir.iterdir()):
+                if not file_path.is_file():
+                    continue
+                # 可执行文件本身已压缩，再次deflate几乎不减小体积，直接存储
+                if file_path.name == exe_name or file_path.suffix.lower() in STORED_SUFFIXES:
+                    zipf.write(file_path, file_path.name, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zipf.write(file_path, file_path.name)
         print(f"✓ 创建压缩包: {archive_path.name}")
         
         return package_dir, archive_path
@@ -185,7 +233,7 @@ class PDFProcessorBuilder:
 ================================
 
 版本信息:
-- 构建时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+- 构建时间: {self.build_time.strftime('%Y-%m-%d %H:%M:%S')}
 - 构建平台: {self.platform} ({self.arch})
 - 可执行文件: {exe_name}
 
@@ -286,11 +334,11 @@ read input_file
             print(f"✗ 可执行文件测试异常: {e}")
             return False
     
-    def build(self, clean=True, install_deps=True, debug=False, test=True):
+    def build(self, full_rebuild=False, install_deps=True, debug=False, test=True):
         """完整构建流程
         
         Args:
-            clean: 是否清理构建目录
+            full_rebuild: 是否清理构建目录并完整重建
             install_deps: 是否安装依赖
             debug: 是否启用调试模式
             test: 是否测试可执行文件
@@ -306,11 +354,11 @@ read input_file
                 self.install_dependencies()
             
             # 清理构建目录
-            if clean:
+            if full_rebuild:
                 self.clean_build_dirs()
             
             # 构建可执行文件
-            self.build_executable(debug=debug)
+            self.build_executable(debug=debug, full_rebuild=full_rebuild)
             
             # 创建分发包
             package_dir, archive_path = self.create_distribution_package()
@@ -336,7 +384,8 @@ read input_file
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='PDF处理器自动化打包脚本')
-    parser.add_argument('--no-clean', action='store_true', help='不清理构建目录')
+    parser.add_argument('--full-rebuild', action='store_true', help='清理构建目录和PyInstaller缓存，完整重建')
+    parser.add_argument('--no-clean', action='store_true', help='不清理构建目录（默认即为增量构建，保留以兼容旧命令）')
     parser.add_argument('--no-deps', action='store_true', help='不安装依赖包')
     parser.add_argument('--debug', action='store_true', help='启用调试模式')
     parser.add_argument('--no-test', action='store_true', help='不测试可执行文件')
@@ -349,7 +398,7 @@ def main():
     
     # 执行构建
     success = builder.build(
-        clean=not args.no_clean,
+        full_rebuild=args.full_rebuild,
         install_deps=not args.no_deps,
         debug=args.debug,
         test=not args.no_test
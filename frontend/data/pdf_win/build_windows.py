@@ -10,10 +10,16 @@ import sys
 import shutil
 import subprocess
 import platform
+import locale
 import zipfile
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+from build import _fast_copy
+
+
 class WindowsPDFProcessorBuilder:
     def __init__(self):
         self.project_dir = Path(__file__).parent.absolute()
@@ -22,6 +28,11 @@ class WindowsPDFProcessorBuilder:
         self.build_dir = self.project_dir / "build"
         self.dist_dir = self.project_dir / "dist"
         self.packages_dir = self.project_dir / "packages"
+        # PyInstaller的缓存目录固定在项目下，增量构建时可以复用
+        self.pyinstaller_cache_dir = self.project_dir / ".pyi_cache"
+        
+        # 构建时间：包名和README使用同一个时间
+        self.build_time = datetime.now()
         
         # 平台信息
         self.host_platform = platform.system().lower()
@@ -36,7 +47,7 @@ class WindowsPDFProcessorBuilder:
         
     def log(self, message):
         """打印带时间戳的日志"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{timestamp}] {message}")
         
     def check_prerequisites(self):
@@ -55,13 +66,11 @@ class WindowsPDFProcessorBuilder:
             raise RuntimeError(f"需要Python 3.8+，当前版本: {python_version.major}.{python_version.minor}")
         self.log(f"✓ Python版本检查通过: {python_version.major}.{python_version.minor}.{python_version.micro}")
         
-        # 检查PyInstaller
+        # 检查PyInstaller：直接读取当前解释器中的版本，不再启动子进程
         try:
-            result = subprocess.run(['pyinstaller', '--version'], 
-                                  capture_output=True, text=True, check=True)
-            pyinstaller_version = result.stdout.strip()
-            self.log(f"✓ PyInstaller版本: {pyinstaller_version}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+            import PyInstaller
+            self.log(f"✓ PyInstaller版本: {PyInstaller.__version__}")
+        except ImportError:
             raise RuntimeError("PyInstaller未安装或不可用")
             
         # 检查关键依赖
@@ -85,44 +94,61 @@ class WindowsPDFProcessorBuilder:
                 shutil.rmtree(dir_path)
                 self.log(f"✓ 已清理: {dir_path}")
                 
-    def build_executable(self):
-        """构建Windows可执行文件"""
+    def build_executable(self, full_rebuild=False):
+        """构建Windows可执行文件
+        
+        Args:
+            full_rebuild: 是否清空PyInstaller缓存完整重建
+        """
         self.log("开始构建Windows可执行文件...")
         
         # 构建命令
         cmd = [
-            'pyinstaller',
-            '--clean',
+            sys.executable, '-m', 'PyInstaller',
             '--noconfirm',
+            '--log-level=WARN',
             str(self.spec_file)
         ]
         
+        # 默认增量构建：复用build目录中的分析结果和PyInstaller缓存中已处理的二进制文件
+        if full_rebuild:
+            cmd.insert(3, '--clean')
+        
         self.log(f"执行命令: {' '.join(cmd)}")
         
-        # 执行构建
+        # 执行构建：输出按字节逐行转发到控制台，只保留最后几行，失败时才解码用于错误信息
         try:
-            result = subprocess.run(cmd, cwd=self.project_dir, 
-                                  capture_output=True, text=True, check=True)
+            output_tail = deque(maxlen=50)
+            env = dict(os.environ, PYINSTALLER_CONFIG_DIR=str(self.pyinstaller_cache_dir))
+            sys.stdout.flush()
+            with subprocess.Popen(cmd, cwd=self.project_dir, env=env,
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+                for line in proc.stdout:
+                    sys.stdout.buffer.write(line)
+                    output_tail.append(line)
+            sys.stdout.buffer.flush()
+            if proc.returncode != 0:
+                output = b''.join(output_tail).decode(locale.getpreferredencoding(False), errors='replace')
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output=output)
             self.log("✓ 构建成功")
             
             # 检查输出文件（在Linux环境下可能没有.exe扩展名）
             exe_name_without_ext = 'pdf_processor'
             exe_name_with_ext = 'pdf_processor.exe'
             
-            # 先检查是否有.exe文件
-            exe_path = self.dist_dir / exe_name_with_ext
-            if not exe_path.exists():
-                # 如果没有.exe文件，检查无扩展名的文件
-                exe_path = self.dist_dir / exe_name_without_ext
+            # 先检查无扩展名的文件：增量构建不清理dist，其中的.exe可能是上次构建复制出来的旧文件
+            exe_path = self.dist_dir / exe_name_without_ext
+            if exe_path.exists():
+                self.log("⚠ 注意: 在Linux环境下生成的是无扩展名的可执行文件")
+                # 重命名为.exe文件以便Windows使用
+                exe_path_renamed = self.dist_dir / exe_name_with_ext
+                _fast_copy(exe_path, exe_path_renamed)
+                exe_path = exe_path_renamed
+                self.log(f"✓ 已重命名为: {exe_name_with_ext}")
+            else:
+                exe_path = self.dist_dir / exe_name_with_ext
                 if not exe_path.exists():
                     raise FileNotFoundError(f"构建的可执行文件不存在: {self.dist_dir}")
-                else:
-                    self.log("⚠ 注意: 在Linux环境下生成的是无扩展名的可执行文件")
-                    # 重命名为.exe文件以便Windows使用
-                    exe_path_renamed = self.dist_dir / exe_name_with_ext
-                    shutil.copy2(exe_path, exe_path_renamed)
-                    exe_path = exe_path_renamed
-                    self.log(f"✓ 已重命名为: {exe_name_with_ext}")
                 
             file_size = exe_path.stat().st_size / (1024 * 1024)  # MB
             self.log(f"✓ Windows可执行文件大小: {file_size:.1f} MB")
@@ -131,60 +157,46 @@ class WindowsPDFProcessorBuilder:
             
         except subprocess.CalledProcessError as e:
             self.log(f"构建失败，退出代码: {e.returncode}")
-            self.log(f"错误输出: {e.stderr}")
-            raise RuntimeError(f"PyInstaller构建失败: {e.stderr}")
+            raise RuntimeError(f"PyInstaller构建失败: {e.output}")
             
     def create_windows_distribution_package(self, exe_path):
-        """创建Windows分发包"""
+        """创建Windows分发包：可执行文件直接从dist写入压缩包，不再复制到中间目录"""
         self.log("创建Windows分发包...")
         
         # 创建包目录
         self.packages_dir.mkdir(exist_ok=True)
         
         # 生成包名
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self.build_time.strftime("%Y%m%d_%H%M%S")
         package_name = f"pdf_processor_windows_{self.arch}_{timestamp}"
-        package_dir = self.packages_dir / package_name
-        
-        # 创建包目录
-        if package_dir.exists():
-            shutil.rmtree(package_dir)
-        package_dir.mkdir(parents=True)
-        
-        # 复制可执行文件
         exe_name = exe_path.name
-        target_exe = package_dir / exe_name
-        shutil.copy2(exe_path, target_exe)
         
-        self.log(f"✓ 已复制可执行文件: {exe_name}")
-        
-        # 创建使用说明
-        readme_content = self._generate_windows_readme(exe_name)
-        readme_path = package_dir / "README.txt"
-        readme_path.write_text(readme_content, encoding='utf-8')
-        self.log("✓ 已创建README.txt")
-        
-        # 创建Windows启动脚本
-        self._create_windows_scripts(package_dir, exe_name)
-        
-        # 创建压缩包
+        # 创建压缩包，压缩包内的文件仍放在以包名命名的目录下
         zip_path = self.packages_dir / f"{package_name}.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in package_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(self.packages_dir)
-                    zipf.write(file_path, arcname)
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, strict_timestamps=False) as zipf:
+            # 可执行文件本身已压缩，再次deflate几乎不减小体积，直接存储
+            zipf.write(exe_path, f"{package_name}/{exe_name}", compress_type=zipfile.ZIP_STORED)
+            self.log(f"✓ 已写入可执行文件: {exe_name}")
+            
+            # 使用说明
+            zipf.writestr(f"{package_name}/README.txt", self._generate_windows_readme(exe_name))
+            self.log("✓ 已写入README.txt")
+            
+            # Windows启动脚本
+            for script_name, script_content in self._generate_windows_scripts(exe_name).items():
+                zipf.writestr(f"{package_name}/{script_name}", script_content)
+            self.log("✓ 已写入Windows批处理脚本")
         
         self.log(f"✓ 已创建压缩包: {zip_path.name}")
         
-        return package_dir, zip_path
+        return zip_path
         
     def _generate_windows_readme(self, exe_name):
         """生成Windows README内容"""
         return f"""PDF处理器 - Windows独立可执行版本
 
 版本信息:
-- 构建时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+- 构建时间: {self.build_time.strftime("%Y-%m-%d %H:%M:%S")}
 - 目标平台: Windows {self.arch}
 - 可执行文件: {exe_name}
 
@@ -233,11 +245,12 @@ class WindowsPDFProcessorBuilder:
 - 建议将程序放在英文路径下运行
 """
 
-    def _create_windows_scripts(self, package_dir, exe_name):
-        """创建Windows启动脚本"""
+    def _generate_windows_scripts(self, exe_name):
+        """生成Windows启动脚本，返回{文件名: 内容}"""
+        scripts = {}
+        
         # 处理PDF脚本
-        process_script = package_dir / "process_pdf.bat"
-        process_script.write_text(f"""@echo off
+        scripts["process_pdf.bat"] = f"""@echo off
 chcp 65001 >nul
 echo PDF处理器 - 批量处理模式
 echo.
@@ -258,29 +271,27 @@ echo.
 echo.
 echo 处理完成，按任意键退出...
 pause >nul
-""", encoding='utf-8')
+"""
         
         # GUI启动脚本
-        gui_script = package_dir / "start_gui.bat"
-        gui_script.write_text(f"""@echo off
+        scripts["start_gui.bat"] = f"""@echo off
 chcp 65001 >nul
 echo 启动PDF处理器图形界面...
 echo.
 "{exe_name}" --gui
-""", encoding='utf-8')
+"""
         
         # 帮助脚本
-        help_script = package_dir / "show_help.bat"
-        help_script.write_text(f"""@echo off
+        scripts["show_help.bat"] = f"""@echo off
 chcp 65001 >nul
 echo PDF处理器 - 帮助信息
 echo.
 "{exe_name}" --help
 echo.
 pause
-""", encoding='utf-8')
+"""
         
-        self.log("✓ 已创建Windows批处理脚本")
+        return scripts
         
     def test_executable_basic(self, exe_path):
         """基本测试可执行文件（在Linux环境下有限测试）"""
@@ -307,8 +318,12 @@ pause
             self.log(f"✗ 文件检查失败: {e}")
             return False
             
-    def build(self):
-        """执行完整构建流程"""
+    def build(self, full_rebuild=False):
+        """执行完整构建流程
+        
+        Args:
+            full_rebuild: 是否清理构建目录并完整重建
+        """
         try:
             self.log("开始PDF处理器Windows构建流程")
             self.log(f"主机平台: {self.host_platform}")
@@ -319,13 +334,14 @@ pause
             self.check_prerequisites()
             
             # 清理构建目录
-            self.clean_build_dirs()
+            if full_rebuild:
+                self.clean_build_dirs()
             
             # 构建可执行文件
-            exe_path = self.build_executable()
+            exe_path = self.build_executable(full_rebuild=full_rebuild)
             
             # 创建分发包
-            package_dir, zip_path = self.create_windows_distribution_package(exe_path)
+            zip_path = self.create_windows_distribution_package(exe_path)
             
             # 基本测试
             test_success = self.test_executable_basic(exe_path)
@@ -333,7 +349,6 @@ pause
             # 构建完成
             self.log("=" * 60)
             self.log("Windows构建完成!")
-            self.log(f"分发包目录: {package_dir}")
             self.log(f"压缩包文件: {zip_path}")
             self.log(f"可执行文件大小: {exe_path.stat().st_size / (1024*1024):.1f} MB")
             self.log(f"基本检查: {'通过' if test_success else '需要在Windows环境下验证'}")
@@ -357,6 +372,8 @@ def main():
     parser = argparse.ArgumentParser(description='PDF处理器Windows构建脚本')
     parser.add_argument('--no-deps', action='store_true', 
                        help='跳过依赖检查（用于测试）')
+    parser.add_argument('--full-rebuild', action='store_true',
+                       help='清理构建目录和PyInstaller缓存，完整重建')
     
     args = parser.parse_args()
     
@@ -365,7 +382,7 @@ def main():
     if args.no_deps:
         builder.log("跳过依赖检查模式")
     
-    success = builder.build()
+    success = builder.build(full_rebuild=args.full_rebuild)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -1,7 +1,21 @@
 #!/usr/bin/env python3
+import os
+import fnmatch
 import rapidocr_onnxruntime
 from pathlib import Path
 
+
+def scan_tree(root):
+    """用os.scandir遍历目录树，产出所有DirEntry；类型和大小来自目录项缓存，不再逐个stat"""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
 print('RapidOCR路径:', Path(rapidocr_onnxruntime.__file__).parent)
 models_path = Path(rapidocr_onnxruntime.__file__).parent / 'models'
 print('模型目录:', models_path)
@@ -9,22 +23,28 @@ print('模型文件存在:', models_path.exists())
 
 if models_path.exists():
     print('模型文件列表:')
-    for f in models_path.rglob('*'):
-        if f.is_file():
-            print('  -', f.name, f'({f.stat().st_size / 1024 / 1024:.1f}MB)')
+    for entry in scan_tree(models_path):
+        if entry.is_file(follow_symlinks=False):
+            print('  -', entry.name, f'({entry.stat().st_size / 1024 / 1024:.1f}MB)')
 else:
     print('模型目录不存在，检查其他可能的位置...')
-    
+
     # 检查包的根目录
     rapidocr_root = Path(rapidocr_onnxruntime.__file__).parent
     print('包根目录内容:')
-    for item in rapidocr_root.iterdir():
-        print('  -', item.name, '(目录)' if item.is_dir() else '(文件)')
-        
-    # 检查是否有其他模型相关目录
-    for pattern in ['*model*', '*onnx*', '*det*', '*rec*', '*cls*']:
-        matches = list(rapidocr_root.rglob(pattern))
-        if matches:
+    with os.scandir(rapidocr_root) as it:
+        for entry in it:
+            print('  -', entry.name, '(目录)' if entry.is_dir() else '(文件)')
+
+    # 检查是否有其他模型相关目录：遍历一次，同时匹配所有模式
+    patterns = ['*model*', '*onnx*', '*det*', '*rec*', '*cls*']
+    matches = {pattern: [] for pattern in patterns}
+    for entry in scan_tree(rapidocr_root):
+        for pattern in patterns:
+            if fnmatch.fnmatch(entry.name, pattern):
+                matches[pattern].append(os.path.relpath(entry.path, rapidocr_root))
+    for pattern in patterns:
+        if matches[pattern]:
             print(f'找到匹配 {pattern} 的文件/目录:')
-            for match in matches:
-                print('  -', match.relative_to(rapidocr_root))
\ No newline at end of file
+            for match in matches[pattern]:
+                print('  -', match)
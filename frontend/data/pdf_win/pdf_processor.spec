@@ -88,7 +88,16 @@ excludes = [
     'notebook',
     'pytest',
     'unittest',
-    'test'
+    'test',
+    'tkinter.test',
+    'lib2to3',
+    'pydoc_data',
+    # 程序运行时用不到的子包，排除后依赖分析和二进制扫描的范围更小
+    'numpy.distutils',
+    'numpy.f2py',
+    'onnxruntime.training',
+    'onnxruntime.quantization',
+    'onnxruntime.transformers'
 ]
 
 a = Analysis(
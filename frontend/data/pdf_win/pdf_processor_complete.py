@@ -13,47 +13,114 @@ import argparse
 import re
 import io
 import threading
+import queue
+import multiprocessing
+import importlib.util
+import unicodedata
+import hashlib
+from collections import deque, OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
 
-# GUI相关导入
-try:
-    import tkinter as tk
-    from tkinter import ttk, filedialog, messagebox, scrolledtext
-    GUI_AVAILABLE = True
-except ImportError:
-    GUI_AVAILABLE = False
-    print("GUI功能不可用，仅支持命令行模式")
-
-# 第三方库导入
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    print("请安装PyMuPDF库: pip install PyMuPDF")
-    sys.exit(1)
-
-try:
-    import openpyxl
-    from openpyxl.drawing.image import Image as ExcelImage
-except ImportError:
-    print("请安装openpyxl库: pip install openpyxl")
-    sys.exit(1)
-
-try:
-    from PIL import Image
-except ImportError:
-    print("请安装Pillow库: pip install Pillow")
-    sys.exit(1)
-
-# OCR库导入（可选）
-RAPIDOCR_AVAILABLE = True
-try:
-    from rapidocr_onnxruntime import RapidOCR
-except Exception as e:
-    print(f"RapidOCR导入失败: {e}")
-    RAPIDOCR_AVAILABLE = False
+# 以下重量级依赖在首次使用时才导入并缓存到模块全局变量，
+# --help和只用到部分功能的命令行路径不必为GUI、PDF、Excel、OCR和NumPy库付出启动时间
+np = None
+tk = ttk = filedialog = messagebox = scrolledtext = None
+fitz = None
+openpyxl = None
+ExcelImage = None
+Image = None
+RapidOCR = None
+cv2 = None
+_cv2_checked = False
+
+
+def _gui_available():
+    """只查找tkinter是否存在，不实际导入"""
+    return (importlib.util.find_spec('tkinter') is not None
+            and importlib.util.find_spec('_tkinter') is not None)
+
+
+def _rapidocr_available():
+    """只查找rapidocr_onnxruntime是否存在，不实际导入"""
+    return importlib.util.find_spec('rapidocr_onnxruntime') is not None
+
+
+def _get_tk():
+    global tk, ttk, filedialog, messagebox, scrolledtext
+    if tk is None:
+        from tkinter import ttk, filedialog, messagebox, scrolledtext
+        import tkinter as tk
+    return tk
+
+
+def _get_fitz():
+    global fitz
+    if fitz is None:
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            raise ImportError("请安装PyMuPDF库: pip install PyMuPDF")
+    return fitz
+
+
+def _get_openpyxl():
+    """导入openpyxl，同时载入ExcelImage"""
+    global openpyxl, ExcelImage
+    if openpyxl is None:
+        try:
+            from openpyxl.drawing.image import Image as ExcelImage
+            import openpyxl
+        except ImportError:
+            raise ImportError("请安装openpyxl库: pip install openpyxl")
+    return openpyxl
+
+
+def _get_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("请安装NumPy库: pip install numpy")
+    return np
+
+
+def _get_pil_image():
+    global Image
+    if Image is None:
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("请安装Pillow库: pip install Pillow")
+    return Image
+
+
+def _get_cv2():
+    """OpenCV（可选，RapidOCR的依赖），用于直接解码图片；不可用时返回None"""
+    global cv2, _cv2_checked
+    if not _cv2_checked:
+        try:
+            import cv2
+        except ImportError:
+            cv2 = None
+        _cv2_checked = True
+    return cv2
+
+
+def _get_rapidocr():
+    global RapidOCR
+    if RapidOCR is None:
+        try:
+            from rapidocr_onnxruntime import RapidOCR
+        except Exception as e:
+            print(f"RapidOCR导入失败: {e}")
+            raise ImportError(f"RapidOCR导入失败: {e}")
+    return RapidOCR
 
 
 # ============================================================================
@@ -69,51 +136,188 @@ class BaseOCR(ABC):
     def recognize(self, img_bytes: bytes) -> List[Dict]:
         """
         识别图片中的文字
-        :param img_bytes: 图片字节数据
+        :param img_bytes: 图片字节数据，或已解码的BGR数组(np.ndarray)
         :return: 识别结果，格式为[{text: str, box: list, score: float}, ...]
         """
         pass
 
+    def recognize_many(self, images: List[bytes]) -> List[List[Dict]]:
+        """依次识别多张图片，返回与输入顺序一致的结果列表"""
+        return [self.recognize(img_bytes) for img_bytes in images]
+
     @abstractmethod
     def close(self):
         pass
 
 
+# 按语言缓存的RapidOCR实例，进程内共享
+_OCR_CACHE = {}
+_OCR_LOCK = threading.Lock()
+
+# 是否按语言参数初始化RapidOCR：打包环境中没有配置文件，直接使用默认配置；
+# 带语言参数初始化失败一次后也不再尝试，避免每次都多加载一次模型
+_OCR_USE_LANG = not getattr(sys, 'frozen', False)
+
+# 多张图片并行识别的线程数；ONNX Runtime单次推理本身也会使用多个线程，不必按核数开满
+OCR_WORKERS = min(4, os.cpu_count() or 1)
+_ocr_executor = None
+
+# 文字识别阶段每次推理的文本行数（RapidOCR默认6）；图纸页面文本行很多，加大批次减少推理调用次数，
+# 文本行按宽高比排序后分批，批内补齐的宽度有限
+OCR_REC_BATCH_NUM = 16
+
+# 页面流水线各阶段之间的队列长度，读取过快时阻塞等待OCR，避免页面数据堆积在内存中
+PIPELINE_QUEUE_SIZE = 8
+
+# 忽略区域达到此数量时按左边界排序并二分查找候选区域，区域较少时直接整体比较更快
+IGNORE_AREA_SORT_MIN = 64
+
+# OCR结果缓存保留的图片数，超出后淘汰最久未用的结果；处理器在GUI中跨多次处理复用，缓存不能无限增长
+OCR_CACHE_SIZE = 256
+
+# 这些压缩格式的图片把原始数据交给OCR解码；其他格式PyMuPDF提取时会先编码成PNG，改为直接取解码后的像素
+OCR_PASSTHROUGH_FILTERS = ("DCTDecode", "JPXDecode")
+
+# fullPage模式OCR时页面渲染的缩放比例：保持1.0，OCR坐标即页面坐标，才能与忽略区域和原生文本块对齐
+PAGE_IMAGE_ZOOM = 1.0
+
+# 导出到Excel的页面图片：Excel中按PAGE_IMAGE_SIZE显示，渲染分辨率不超过显示尺寸的PAGE_IMAGE_SCALE倍，保存为JPEG
+PAGE_IMAGE_SIZE = (600, 800)
+PAGE_IMAGE_SCALE = 1.5
+PAGE_IMAGE_QUALITY = 85
+
+# 保存页面图片的线程数：主线程渲染，JPEG编码和写文件放到线程池中与下一页的渲染重叠
+IMAGE_SAVE_WORKERS = min(4, os.cpu_count() or 1)
+
+# 逐页处理时每隔多少页输出一次进度，最后一页总会输出
+PROGRESS_EVERY = 10
+
+# 批量验证Excel图片时同时处理的文件数
+VERIFY_WORKERS = min(4, os.cpu_count() or 1)
+
+# 按页多进程提取的进程数：每个进程各自加载一份OCR模型，只用一半核数，给ONNX Runtime的推理线程留出余量
+PAGE_PROCESSES = max(1, min(4, (os.cpu_count() or 1) // 2))
+# 页数少于此值时不启用多进程，子进程加载模型的开销比节省的时间还多
+PAGE_PROCESSES_MIN_PAGES = 8
+
+# 批量处理时按文件并行的进程数，同样每个进程各自加载一份OCR模型
+BATCH_PROCESSES = max(1, min(4, (os.cpu_count() or 1) // 2))
+
+
+def _get_ocr_executor():
+    """进程内共用的OCR线程池，首次使用时创建"""
+    global _ocr_executor
+    with _OCR_LOCK:
+        if _ocr_executor is None:
+            _ocr_executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+        return _ocr_executor
+
+
 class RapidOCRWrapper(BaseOCR):
     def __init__(self, lang: str = "ch"):
-        if not RAPIDOCR_AVAILABLE:
+        if not _rapidocr_available():
             raise ImportError(
                 "RapidOCR is not available. This may be due to packaging limitations or missing configuration files."
             )
         
         self.lang = lang
-        try:
-            # 在打包环境中，尝试不使用配置文件初始化
-            if getattr(sys, 'frozen', False):
-                # 打包环境，使用最简单的初始化方式
-                self.ocr = RapidOCR()
-            else:
-                # 正常环境
-                self.ocr = RapidOCR(lang=lang)
-        except Exception as e:
-            print(f"RapidOCR初始化失败: {e}")
-            # 尝试使用默认配置初始化
+        # 模型在首次识别时才加载：按页多进程处理时父进程只分发任务，不需要模型
+        self._ocr = None
+
+    @property
+    def ocr(self):
+        """模型只在进程内加载一次，之后的实例共用；RapidOCR底层的ONNX Runtime会话可以多线程同时推理"""
+        if self._ocr is None:
+            with _OCR_LOCK:
+                ocr = _OCR_CACHE.get(self.lang)
+                if ocr is None:
+                    ocr = self._create_ocr(self.lang)
+                    _OCR_CACHE[self.lang] = ocr
+            self._ocr = ocr
+        return self._ocr
+
+    @staticmethod
+    def _create_ocr(lang):
+        ocr = RapidOCRWrapper._init_rapidocr(lang)
+        # 不同版本的RapidOCR构造参数不同，批次大小直接设置在识别器上，没有该属性的版本保持默认
+        text_rec = getattr(ocr, 'text_rec', None)
+        if getattr(text_rec, 'rec_batch_num', 0) and text_rec.rec_batch_num < OCR_REC_BATCH_NUM:
+            text_rec.rec_batch_num = OCR_REC_BATCH_NUM
+        return ocr
+
+    @staticmethod
+    def _int8_model_paths(lang: str) -> Dict[str, str]:
+        """RapidOCR模型目录中由quantize_models.py生成的该语言的INT8模型，返回对应的构造参数；
+        模型文件名以语言为前缀（如ch_PP-OCRv4_det_infer.int8.onnx），检测和识别模型缺一个时返回空，使用原模型"""
+        spec = importlib.util.find_spec("rapidocr_onnxruntime")
+        if spec is None or not spec.origin:
+            return {}
+        models_path = os.path.join(os.path.dirname(spec.origin), 'models')
+        if not os.path.isdir(models_path):
+            return {}
+        model_paths = {}
+        with os.scandir(models_path) as it:
+            for entry in it:
+                if not entry.name.endswith('.int8.onnx') or entry.name.split('_', 1)[0] != lang:
+                    continue
+                for key in ('det', 'rec'):
+                    if key in entry.name:
+                        model_paths[f'{key}_model_path'] = entry.path
+        if len(model_paths) < 2:
+            return {}
+        return model_paths
+
+    @staticmethod
+    def _init_rapidocr(lang):
+        global _OCR_USE_LANG
+        rapid_ocr = _get_rapidocr()
+        # 有量化模型时优先使用：权重和内存占用减半，支持VNNI的CPU上卷积和矩阵乘法更快
+        model_paths = RapidOCRWrapper._int8_model_paths(lang)
+        if model_paths:
+            try:
+                ocr = rapid_ocr(**model_paths)
+                print(f"使用INT8量化模型初始化RapidOCR成功: {', '.join(sorted(model_paths))}")
+                return ocr
+            except Exception as e:
+                print(f"INT8量化模型初始化失败，使用原模型: {e}")
+        if _OCR_USE_LANG:
             try:
-                self.ocr = RapidOCR()
+                return rapid_ocr(lang=lang)
+            except Exception as e:
+                print(f"RapidOCR初始化失败: {e}")
+                # 之后的实例不再尝试带语言参数初始化
+                _OCR_USE_LANG = False
+        # 打包环境或带语言参数初始化失败时，使用默认配置初始化
+        try:
+            ocr = rapid_ocr()
+            if not getattr(sys, 'frozen', False):
                 print("使用默认配置初始化RapidOCR成功")
-            except Exception as e2:
-                print(f"RapidOCR默认初始化也失败: {e2}")
-                raise ImportError(f"RapidOCR无法初始化: {e2}")
+            return ocr
+        except Exception as e2:
+            print(f"RapidOCR默认初始化也失败: {e2}")
+            raise ImportError(f"RapidOCR无法初始化: {e2}")
 
     def recognize(self, img_bytes: bytes) -> List[Dict]:
+        # 模型加载失败时直接抛出，不当作单张图片的识别错误
+        ocr = self.ocr
         try:
-            img = Image.open(io.BytesIO(img_bytes))
-            
-            # 转换为RGB格式以确保OCR兼容性
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            result, _ = self.ocr(img)
+            # 直接解码为RapidOCR内部使用的BGR数组，避免PIL图像在RapidOCR中再转换一次
+            img = None
+            np = _get_numpy()
+            cv2 = _get_cv2()
+            if isinstance(img_bytes, np.ndarray):
+                # 已经是渲染好的BGR数组，直接识别
+                img = img_bytes
+            elif cv2 is not None:
+                img = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                # 没有OpenCV或OpenCV无法解码该格式时使用PIL
+                pil_img = _get_pil_image().open(io.BytesIO(img_bytes))
+                if pil_img.mode != 'RGB':
+                    pil_img = pil_img.convert('RGB')
+                img = np.ascontiguousarray(np.asarray(pil_img)[:, :, ::-1])
+            
+            result, _ = ocr(img)
 
             if not result:
                 return []
@@ -138,6 +342,12 @@ class RapidOCRWrapper(BaseOCR):
             traceback.print_exc()
             return []
 
+    def recognize_many(self, images: List[bytes]) -> List[List[Dict]]:
+        """并行识别多张图片，推理在ONNX Runtime中进行，期间释放GIL"""
+        if len(images) <= 1:
+            return [self.recognize(img_bytes) for img_bytes in images]
+        return list(_get_ocr_executor().map(self.recognize, images))
+
     def close(self):
         pass
 
@@ -146,6 +356,22 @@ class RapidOCRWrapper(BaseOCR):
 # 段落解析器
 # ============================================================================
 
+# 中日韩文字及全角标点所在的码位区间，均在BMP内，预先展开成按码位索引的表
+_CJK_RANGES = [
+    (0x4E00, 0x9FFF), (0x3040, 0x30FF), (0x1100, 0x11FF),
+    (0x3130, 0x318F), (0xAC00, 0xD7AF), (0x3000, 0x303F),
+    (0xFE30, 0xFE4F), (0xFF00, 0xFFEF)
+]
+_CJK_BITMAP = bytearray(0x10000)
+for _start, _end in _CJK_RANGES:
+    _CJK_BITMAP[_start:_end + 1] = b"\x01" * (_end - _start + 1)
+
+
+def _is_cjk(character):
+    code = ord(character)
+    return code < 0x10000 and _CJK_BITMAP[code] == 1
+
+
 class ParagraphParse:
     def __init__(self, get_info, set_end) -> None:
         self.get_info = get_info
@@ -160,20 +386,30 @@ class ParagraphParse:
         units = []
         for tb in text_blocks:
             bbox, text = get_info(tb)
+            # 空白文本块（OCR噪声）不参与分段
+            if not text or not text.strip():
+                continue
             units.append((bbox, (text[0], text[-1]), tb))
         return units
 
     def _parse(self, units):
         if not units:
             return
-        # 从bbox坐标点计算边界框
-        def get_bbox_bounds(bbox):
-            xs = [point[0] for point in bbox]
-            ys = [point[1] for point in bbox]
-            return min(xs), min(ys), max(xs), max(ys)
-        
-        units.sort(key=lambda a: get_bbox_bounds(a[0])[1])  # 按top排序
-        para_l, para_top, para_r, para_bottom = get_bbox_bounds(units[0][0])
+        # 一次性从bbox坐标点计算所有边界框 (N,4,2) -> (N,4)，并按top稳定排序
+        np = _get_numpy()
+        points = np.asarray([unit[0] for unit in units], dtype=np.float64)
+        xs, ys = points[:, :, 0], points[:, :, 1]
+        bounds = np.stack([xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)], axis=1)
+        # 面积不足1的退化框会把行高、行距统计拉向0，不参与分段
+        areas = (bounds[:, 2] - bounds[:, 0]) * (bounds[:, 3] - bounds[:, 1])
+        keep = np.flatnonzero(areas >= 1)
+        if keep.size == 0:
+            return
+        order = keep[np.argsort(bounds[keep, 1], kind="stable")]
+        units = [units[i] for i in order]
+        bounds = bounds[order].tolist()
+        
+        para_l, para_top, para_r, para_bottom = bounds[0]
         para_line_h = para_bottom - para_top
         para_line_s = None
         now_para = [units[0]]
@@ -181,7 +417,7 @@ class ParagraphParse:
         paras_line_space = [para_line_s]
 
         for i in range(1, len(units)):
-            l, top, r, bottom = get_bbox_bounds(units[i][0])
+            l, top, r, bottom = bounds[i]
             h = bottom - top
             ls = top - para_bottom
 
@@ -210,19 +446,10 @@ class ParagraphParse:
             self.set_end(para[-1][2], "\n")
 
     def _word_separator(self, letter1, letter2):
-        def is_cjk(character):
-            cjk_ranges = [
-                (0x4E00, 0x9FFF), (0x3040, 0x30FF), (0x1100, 0x11FF),
-                (0x3130, 0x318F), (0xAC00, 0xD7AF), (0x3000, 0x303F),
-                (0xFE30, 0xFE4F), (0xFF00, 0xFFEF)
-            ]
-            return any(start <= ord(character) <= end for start, end in cjk_ranges)
-
-        if is_cjk(letter1) and is_cjk(letter2):
+        if _is_cjk(letter1) and _is_cjk(letter2):
             return ""
         if letter1 == "-":
             return ""
-        import unicodedata
         if unicodedata.category(letter2).startswith("P"):
             return ""
         return " "
@@ -237,6 +464,13 @@ class PDFProcessor:
         self.ocr_engine = ocr_engine
         self.password = password
         self.doc = None
+        # OCR结果按图片内容哈希缓存，重复出现的图片（logo、印章、页眉等）只识别一次；按LRU保留OCR_CACHE_SIZE个
+        self._ocr_cache = OrderedDict()
+        # mixed模式下，原生文本超过skip_ocr_min_chars个字符的页面视为文字版PDF，
+        # 其中占页面面积不足skip_ocr_max_area或像素数不足skip_ocr_min_pixels的装饰性小图不再OCR
+        self.skip_ocr_min_chars = 200
+        self.skip_ocr_max_area = 0.05
+        self.skip_ocr_min_pixels = 64 * 64
         self.paragraph_parser = ParagraphParse(
             get_info=lambda tb: (tb["box"], tb["text"]),
             set_end=lambda tb, sep: tb.update({"end": sep})
@@ -244,7 +478,7 @@ class PDFProcessor:
 
     def load_document(self, path: str) -> bool:
         try:
-            self.doc = fitz.open(path)
+            self.doc = _get_fitz().open(path)
             if self.doc.is_encrypted and not self.doc.authenticate(self.password):
                 raise Exception("密码错误或文档已加密")
             return True
@@ -259,21 +493,47 @@ class PDFProcessor:
         page = self.doc[page_num]
         images = []
         img_list = page.get_images(full=True)
+        if not img_list:
+            return images
+
+        # 一次解析页面内容流得到所有图片的位置，同一图片出现多次时取第一次的位置
+        img_rects = {}
+        for info in page.get_image_info(xrefs=True):
+            img_rects.setdefault(info["xref"], info["bbox"])
 
         for img in img_list:
             xref = img[0]
-            base_image = self.doc.extract_image(xref)
-            img_bytes = base_image["image"]
-            img_rect = page.get_image_rects(xref)[0]
+            img_rect = img_rects.get(xref)
+            if img_rect is None:
+                # 没有在页面上显示的图片
+                continue
+            img_bytes = None
+            if img[8] not in OCR_PASSTHROUGH_FILTERS:
+                img_bytes = self._image_array(xref)
+            if img_bytes is None:
+                img_bytes = self.doc.extract_image(xref)["image"]
 
             images.append({
                 "bytes": img_bytes,
-                "bbox": [img_rect.x0, img_rect.y0, img_rect.x1, img_rect.y1],
-                "width": base_image["width"],
-                "height": base_image["height"]
+                "bbox": list(img_rect),
+                "width": img[2],
+                "height": img[3]
             })
         return images
 
+    def _image_array(self, xref: int) -> Optional['np.ndarray']:
+        """把图片解码为OCR使用的BGR数组，省去extract_image编码PNG、OCR时再解码PNG的往返；无法转换时返回None"""
+        try:
+            fitz = _get_fitz()
+            pix = fitz.Pixmap(self.doc, xref)
+            if pix.alpha:
+                pix = fitz.Pixmap(pix, 0)
+            if pix.colorspace is None or pix.colorspace.n != 3:
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            return _pixmap_to_bgr(pix)
+        except Exception:
+            return None
+
     def extract_text(self, page_num: int, mode: str = "mixed", ignore_areas: List[List[float]] = None) -> List[Dict]:
         """
         提取PDF页面文本
@@ -285,9 +545,99 @@ class PDFProcessor:
         if not self.doc or page_num < 0 or page_num >= len(self.doc):
             return []
 
+        ignore_areas = self._as_areas(ignore_areas)
+        text_blocks, images = self._read_page(page_num, mode, ignore_areas)
+        text_blocks.extend(self._ocr_images(images, ignore_areas))
+        return self.paragraph_parser.run(text_blocks)
+
+    def iter_pages(self, mode: str = "mixed", ignore_areas: List[List[float]] = None, on_page=None):
+        """
+        流水线提取所有页面：页面读取、OCR识别、段落解析分别在读取线程、OCR线程和调用方线程中进行，
+        阶段之间用有界队列连接，总耗时接近最慢的一个阶段而不是各阶段之和
+        :param on_page: 在读取线程中按页码顺序调用on_page(page_num, page)，需要使用页面对象的额外处理放在这里，
+                        文档对象不跨线程使用
+        :return: 按页码顺序产出(page_num, 文本块列表)
+        """
+        if not self.doc:
+            return
+
+        ignore_areas = self._as_areas(ignore_areas)
+        read_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        ocr_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        stop = threading.Event()
+
+        # 调用方提前退出时，工作线程不再阻塞在队列上
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return None
+
+        def read_pages():
+            # 文档对象只在这个线程中访问
+            try:
+                for page_num in range(len(self.doc)):
+                    text_blocks, images = self._read_page(page_num, mode, ignore_areas)
+                    if on_page is not None:
+                        on_page(page_num, self.doc[page_num])
+                    if not put(read_queue, (page_num, text_blocks, images)):
+                        return
+            except Exception as e:
+                put(read_queue, e)
+                return
+            put(read_queue, None)
+
+        def ocr_pages():
+            while True:
+                item = get(read_queue)
+                if item is None or isinstance(item, Exception):
+                    put(ocr_queue, item)
+                    return
+                page_num, text_blocks, images = item
+                try:
+                    text_blocks.extend(self._ocr_images(images, ignore_areas))
+                except Exception as e:
+                    put(ocr_queue, e)
+                    return
+                if not put(ocr_queue, (page_num, text_blocks)):
+                    return
+
+        workers = [
+            threading.Thread(target=read_pages, name="pdf-read", daemon=True),
+            threading.Thread(target=ocr_pages, name="pdf-ocr", daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                item = ocr_queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                page_num, text_blocks = item
+                yield page_num, self.paragraph_parser.run(text_blocks)
+        finally:
+            stop.set()
+            # 读取线程结束后才能关闭文档
+            for worker in workers:
+                worker.join()
+
+    def _read_page(self, page_num: int, mode: str, ignore_areas: 'np.ndarray') -> Tuple[List[Dict], List[bytes]]:
+        """读取页面的原生文本块和需要OCR的图片"""
         page = self.doc[page_num]
         text_blocks = []
-        ignore_areas = ignore_areas or []
 
         # 提取原生文本
         if mode in ["mixed", "textOnly"]:
@@ -295,8 +645,15 @@ class PDFProcessor:
             for block in blocks:
                 if block["type"] == 0:  # 文本块
                     for line in block["lines"]:
-                        text = "".join([span["text"] for span in line["spans"]])
-                        if text and not self._is_in_ignore_area(line["bbox"], ignore_areas):
+                        spans = line["spans"]
+                        if not spans:
+                            continue
+                        # 多数行只有一个span，直接取文本，不必拼接
+                        if len(spans) == 1:
+                            text = spans[0]["text"]
+                        else:
+                            text = "".join([span["text"] for span in spans])
+                        if text:
                             bbox = line["bbox"]
                             text_blocks.append({
                                 "box": [
@@ -307,57 +664,281 @@ class PDFProcessor:
                                 "from": "text",
                                 "end": ""
                             })
-
-        # 处理图片中的文本
-        if mode in ["mixed", "imageOnly", "fullPage"]:
-            if mode == "fullPage":
-                pix = page.get_pixmap()
-                img_bytes = pix.tobytes("png")
-                ocr_blocks = self._ocr_image(img_bytes)
-                text_blocks.extend(self._filter_ignore_areas(ocr_blocks, ignore_areas))
+            text_blocks = self._filter_ignore_areas(text_blocks, ignore_areas)
+
+        # 需要识别文本的图片
+        if mode == "fullPage":
+            images = [self.render_page_array(page_num)]
+        elif mode in ["mixed", "imageOnly"]:
+            page_images = self.extract_images(page_num)
+            if mode == "mixed" and page_images:
+                page_images = self._drop_decorative_images(page, text_blocks, page_images)
+            images = [img["bytes"] for img in page_images]
+        else:
+            images = []
+        return text_blocks, images
+
+    @staticmethod
+    def _ocr_cache_key(img) -> bytes:
+        """图片的缓存键：编码后的字节直接取哈希；像素数组同时计入形状和类型，字节相同但尺寸不同的数组不会混用结果"""
+        h = hashlib.blake2b(digest_size=16)
+        if isinstance(img, bytes):
+            h.update(img)
+        else:
+            h.update(repr((img.shape, img.dtype.str)).encode())
+            h.update(img)
+        return h.digest()
+
+    def _recognize_many(self, images: List[bytes]) -> List[List[Dict]]:
+        """带缓存的批量识别，只把未识别过的图片交给OCR引擎"""
+        keys = [self._ocr_cache_key(img) for img in images]
+        results = {}
+        missing = {}
+        for key, img in zip(keys, images):
+            if key in results or key in missing:
+                continue
+            cached = self._ocr_cache.get(key)
+            if cached is not None:
+                self._ocr_cache.move_to_end(key)
+                results[key] = cached
             else:
-                for img in self.extract_images(page_num):
-                    ocr_blocks = self._ocr_image(img["bytes"])
-                    text_blocks.extend(self._filter_ignore_areas(ocr_blocks, ignore_areas))
-
-        return self.paragraph_parser.run(text_blocks)
+                missing[key] = img
+        if missing:
+            results.update(zip(missing.keys(), self.ocr_engine.recognize_many(list(missing.values()))))
+            for key in missing:
+                self._ocr_cache[key] = results[key]
+            while len(self._ocr_cache) > OCR_CACHE_SIZE:
+                self._ocr_cache.popitem(last=False)
+        return [results[key] for key in keys]
+
+    def _drop_decorative_images(self, page, text_blocks: List[Dict], images: List[Dict]) -> List[Dict]:
+        """文字版页面上的小图通常是logo、图标等装饰，跳过这些图片的OCR"""
+        native_chars = sum(len(block["text"]) for block in text_blocks)
+        if native_chars <= self.skip_ocr_min_chars:
+            return images
+        page_area = page.rect.width * page.rect.height
+        kept = []
+        for img in images:
+            x0, y0, x1, y1 = img["bbox"]
+            area_frac = (x1 - x0) * (y1 - y0) / page_area if page_area > 0 else 1.0
+            if area_frac < self.skip_ocr_max_area or img["width"] * img["height"] < self.skip_ocr_min_pixels:
+                continue
+            kept.append(img)
+        return kept
+
+    def _ocr_images(self, images: List[bytes], ignore_areas: 'np.ndarray') -> List[Dict]:
+        text_blocks = []
+        for ocr_result in self._recognize_many(images):
+            ocr_blocks = self._to_ocr_blocks(ocr_result)
+            text_blocks.extend(self._filter_ignore_areas(ocr_blocks, ignore_areas))
+        return text_blocks
 
     def _ocr_image(self, img_bytes: bytes) -> List[Dict]:
-        ocr_result = self.ocr_engine.recognize(img_bytes)
+        return self._to_ocr_blocks(self._recognize_many([img_bytes])[0])
+
+    def _to_ocr_blocks(self, ocr_result: List[Dict]) -> List[Dict]:
+        # 识别结果可能来自缓存，坐标复制一份，避免多个文本块共用同一列表
         return [{
-            "box": item["box"],
+            "box": [list(point) for point in item["box"]],
             "text": item["text"],
             "from": "ocr",
             "end": "",
             "score": item["score"]
         } for item in ocr_result]
 
-    def _is_in_ignore_area(self, bbox: List[float], ignore_areas: List[List[float]]) -> bool:
-        """检查文本块是否在忽略区域内"""
-        x0, y0, x1, y1 = bbox
-        center_x, center_y = (x0 + x1) / 2, (y0 + y1) / 2
-
-        for area in ignore_areas:
-            ax0, ay0, ax1, ay1 = area
-            if ax0 <= center_x <= ax1 and ay0 <= center_y <= ay1:
-                return True
-        return False
-
-    def _filter_ignore_areas(self, blocks: List[Dict], ignore_areas: List[List[float]]) -> List[Dict]:
-        """过滤掉忽略区域内的文本块"""
-        filtered = []
-        for block in blocks:
-            bbox = [
-                block["box"][0][0], block["box"][0][1],
-                block["box"][2][0], block["box"][2][1]
-            ]
-            if not self._is_in_ignore_area(bbox, ignore_areas):
-                filtered.append(block)
-        return filtered
+    @staticmethod
+    def _as_areas(ignore_areas) -> 'np.ndarray':
+        """忽略区域转换为(M, 4)数组，每页只转换一次；区域较多时按左边界排序"""
+        np = _get_numpy()
+        areas = np.asarray(ignore_areas if ignore_areas is not None else [], dtype=np.float64).reshape(-1, 4)
+        if len(areas) >= IGNORE_AREA_SORT_MIN:
+            areas = areas[np.argsort(areas[:, 0], kind="stable")]
+        return areas
+
+    def _filter_ignore_areas(self, blocks: List[Dict], ignore_areas: 'np.ndarray') -> List[Dict]:
+        """过滤掉中心点落在忽略区域内的文本块，ignore_areas为_as_areas转换后的数组"""
+        if not blocks or len(ignore_areas) == 0:
+            return blocks
+        np = _get_numpy()
+        areas = ignore_areas
+        boxes = np.array([
+            [block["box"][0][0], block["box"][0][1], block["box"][2][0], block["box"][2][1]]
+            for block in blocks
+        ], dtype=np.float64)
+        center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+        center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+        if len(areas) < IGNORE_AREA_SORT_MIN:
+            cx, cy = center_x[:, None], center_y[:, None]
+            ignored = ((cx >= areas[:, 0]) & (cx <= areas[:, 2])
+                       & (cy >= areas[:, 1]) & (cy <= areas[:, 3])).any(axis=1)
+        else:
+            # 区域已按左边界排序，左边界不超过中心点的区域是一个前缀；
+            # 只与最长前缀内的区域一起广播比较，并用掩码截掉每个文本块前缀之外的区域
+            counts = np.searchsorted(areas[:, 0], center_x, side="right")
+            candidates = areas[:counts.max()]
+            cx, cy = center_x[:, None], center_y[:, None]
+            in_prefix = np.arange(len(candidates)) < counts[:, None]
+            ignored = (in_prefix & (cx <= candidates[:, 2])
+                       & (cy >= candidates[:, 1]) & (cy <= candidates[:, 3])).any(axis=1)
+        return [block for block, skip in zip(blocks, ignored) if not skip]
+
+    def render_page_array(self, page_num: int) -> 'np.ndarray':
+        """按PAGE_IMAGE_ZOOM把页面渲染为OCR直接使用的BGR数组，不经过PNG编码和解码"""
+        fitz = _get_fitz()
+        pix = self.doc[page_num].get_pixmap(matrix=fitz.Matrix(PAGE_IMAGE_ZOOM, PAGE_IMAGE_ZOOM), alpha=False)
+        return _pixmap_to_bgr(pix)
 
     def close(self):
         if self.doc:
             self.doc.close()
+            self.doc = None
+
+
+def _pixmap_to_bgr(pix) -> 'np.ndarray':
+    """RGB像素直接按内存视图读取，只在翻转为BGR时复制一次"""
+    np = _get_numpy()
+    rgb = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride // pix.n, pix.n)
+    return np.ascontiguousarray(rgb[:, :pix.width, ::-1])
+
+
+def _page_image_path(output_dir: str, pdf_path: str, page_num: int) -> str:
+    """页面图片的保存路径：{PDF文件名}_page_{页码}.jpg"""
+    pdf_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(output_dir, f"{pdf_name}_page_{page_num + 1}.jpg")
+
+
+def _render_page_pixmap(page, matrices: Dict):
+    """把页面渲染为导出到Excel用的RGB像素，matrices按页面尺寸缓存缩放矩阵"""
+    # 缩放到Excel中显示尺寸的PAGE_IMAGE_SCALE倍，更高的分辨率在Excel中看不出来
+    page_size = (page.rect.width, page.rect.height)
+    mat = matrices.get(page_size)
+    if mat is None:
+        zoom = min(PAGE_IMAGE_SIZE[0] * PAGE_IMAGE_SCALE / page_size[0],
+                   PAGE_IMAGE_SIZE[1] * PAGE_IMAGE_SCALE / page_size[1])
+        mat = matrices[page_size] = _get_fitz().Matrix(zoom, zoom)
+    return page.get_pixmap(matrix=mat, alpha=False)
+
+
+def _encode_jpeg(path: str, samples, width: int, height: int, stride: int):
+    """把RGB像素编码为JPEG写入文件；PIL编码时释放GIL，可以在多个线程中同时进行"""
+    Image = _get_pil_image()
+    img = Image.frombuffer("RGB", (width, height), samples, "raw", "RGB", stride, 1)
+    # 整张图片编码到足够大的缓冲区中，关闭文件时一次写入
+    with open(path, 'wb', buffering=1 << 20) as f:
+        img.save(f, "JPEG", quality=PAGE_IMAGE_QUALITY)
+
+
+def _insert_images_into_sheet(ws, image_paths: List[str], start_row: int = 2, start_col: int = 2,
+                              width: int = 600, height: int = 800, indent: str = "  ", log=print) -> int:
+    """清除工作表中原有的图片后插入页面图片：不超过两张时横向排列，否则每行两张；返回插入的图片数"""
+    _get_openpyxl()
+    from openpyxl.utils import get_column_letter
+    
+    ws._images.clear()
+    two_per_row = len(image_paths) > 2
+    
+    for i, image_path in enumerate(image_paths):
+        if not os.path.exists(image_path):
+            continue
+        try:
+            # 创建Excel图片对象并调整大小
+            img = ExcelImage(image_path)
+            img.width = width
+            img.height = height
+            
+            # 计算图片位置并设置锚点
+            col_offset = (i % 2) * 10 if two_per_row else i * 10
+            row_offset = (i // 2) * 50 if two_per_row else 0
+            img.anchor = f"{get_column_letter(start_col + col_offset)}{start_row + row_offset}"
+            
+            ws.add_image(img)
+            log(f"{indent}插入图片: {os.path.basename(image_path)}")
+        except Exception as e:
+            log(f"{indent}插入图片 {image_path} 时出错: {e}")
+    
+    return len(ws._images)
+
+
+# ============================================================================
+# 多进程按页提取
+# ============================================================================
+
+_page_pool = None
+_page_pool_lang = None
+# 子进程内的处理器，按文件缓存打开的文档；fitz文档对象不能跨进程共享，每个进程自己打开
+_worker_processor = None
+# 当前打开文档的标识：(路径, 修改时间, 大小, 密码)，文件被替换、修改或密码不同时重新打开
+_worker_doc_key = None
+_worker_matrices = {}
+
+
+def _init_page_worker(lang: str):
+    global _worker_processor
+    ocr_engine = RapidOCRWrapper(lang=lang)
+    # 子进程启动时就加载模型，各进程同时加载
+    ocr_engine.ocr
+    _worker_processor = PDFProcessor(ocr_engine)
+
+
+def _extract_page_worker(task: Tuple[str, int, str, str, Optional[str]]) -> Tuple[int, List[Dict]]:
+    global _worker_doc_key
+    pdf_path, page_num, password, mode, image_path = task
+    processor = _worker_processor
+    st = os.stat(pdf_path)
+    doc_key = (pdf_path, st.st_mtime_ns, st.st_size, password)
+    if _worker_doc_key != doc_key:
+        processor.close()
+        processor.doc = None
+        _worker_doc_key = None
+        processor.password = password
+        if not processor.load_document(pdf_path):
+            raise Exception(f"无法加载PDF文件: {pdf_path}")
+        _worker_doc_key = doc_key
+    text_blocks = processor.extract_text(page_num, mode=mode)
+    if image_path:
+        # 页面图片也在子进程中渲染和保存，各进程用自己打开的文档并行渲染
+        # 在同一线程中同步编码，直接使用像素的内存视图，不复制整页像素
+        pix = _render_page_pixmap(processor.doc[page_num], _worker_matrices)
+        _encode_jpeg(image_path, pix.samples_mv, pix.width, pix.height, pix.stride)
+    return page_num, text_blocks
+
+
+def _mp_context():
+    """Linux上用forkserver启动子进程：不继承父进程中的线程和已加载的GUI、PDF库，
+    子进程只导入本模块，重量级依赖在使用时才加载；打包环境和其他平台使用默认方式"""
+    if not getattr(sys, 'frozen', False) and 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+
+def _get_page_pool(lang: str) -> ProcessPoolExecutor:
+    """进程内共用的按页提取进程池，子进程和其中的OCR模型在多个PDF之间复用"""
+    global _page_pool, _page_pool_lang
+    # 语言变化时重新创建
+    if _page_pool is not None and _page_pool_lang != lang:
+        _discard_page_pool()
+    if _page_pool is None:
+        _page_pool = ProcessPoolExecutor(max_workers=PAGE_PROCESSES, mp_context=_mp_context(),
+                                         initializer=_init_page_worker, initargs=(lang,))
+        _page_pool_lang = lang
+    return _page_pool
+
+
+def _discard_page_pool():
+    """关闭并丢弃按页提取进程池；子进程异常退出（BrokenProcessPool）后由下次_get_page_pool重新创建"""
+    global _page_pool
+    if _page_pool is not None:
+        _page_pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+
+
+def _map_pages(lang: str, tasks: List[Tuple]):
+    """把页面任务分发到进程池；进程池在空闲时已经损坏的，重新创建后再提交一次"""
+    try:
+        return _get_page_pool(lang).map(_extract_page_worker, tasks, chunksize=2)
+    except BrokenProcessPool:
+        _discard_page_pool()
+        return _get_page_pool(lang).map(_extract_page_worker, tasks, chunksize=2)
 
 
 # ============================================================================
@@ -374,54 +955,112 @@ class PDFToExcelProcessor:
             ocr_engine: OCR引擎类型 ('rapid')
             lang: 识别语言
         """
+        self.lang = lang
         # 初始化OCR引擎
-        if RAPIDOCR_AVAILABLE:
+        if _rapidocr_available():
             self.ocr_engine = RapidOCRWrapper(lang=lang)
         else:
             raise ImportError("RapidOCR不可用")
         
         self.pdf_processor = PDFProcessor(self.ocr_engine)
+        # Excel模板文件内容：(路径, 修改时间, 大小, 文件内容)，批量处理时只读一次模板文件；
+        # 同一个openpyxl工作簿保存第二次时内容不完整，每个文件仍从内容重新解析
+        self._template_cache = None
         
-    def extract_pdf_data(self, pdf_path: str) -> List[Dict]:
+    def extract_pdf_data(self, pdf_path: str, close: bool = True) -> List[Dict]:
         """从PDF中提取文本数据
         
         Args:
             pdf_path: PDF文件路径
+            close: 提取完成后是否关闭文档；为False时由调用方在之后调用self.pdf_processor.close()
             
         Returns:
             提取的文本块列表
         """
+        all_text_blocks = []
+        for _, text_blocks in self.iter_pdf_data(pdf_path, close=close):
+            all_text_blocks.extend(text_blocks)
+        return all_text_blocks
+    
+    def iter_pdf_data(self, pdf_path: str, close: bool = True, image_dir: str = None):
+        """逐页提取PDF文本数据，处理完一页产出一页，不在内存中保留整个文档的文本块
+        
+        Args:
+            pdf_path: PDF文件路径
+            close: 提取完成后是否关闭文档；为False时由调用方在之后调用self.pdf_processor.close()
+            image_dir: 不为None时同时把每页保存为JPEG图片到该目录，与文本提取重叠进行；
+                       产出某页时该页图片已保存完成
+            
+        Returns:
+            按页码顺序产出(page_num, 文本块列表)的生成器
+        """
         print(f"开始处理PDF文件: {pdf_path}")
         
         if not self.pdf_processor.load_document(pdf_path):
             raise Exception(f"无法加载PDF文件: {pdf_path}")
         
-        all_text_blocks = []
+        block_count = 0
+        executor = None
+        futures = {}
+        pipeline = None
         
         try:
-            # 处理所有页面
-            for page_num in range(len(self.pdf_processor.doc)):
-                print(f"正在处理第{page_num + 1}页...")
-                text_blocks = self.pdf_processor.extract_text(page_num, mode="mixed")
+            page_count = len(self.pdf_processor.doc)
+            if PAGE_PROCESSES > 1 and page_count >= PAGE_PROCESSES_MIN_PAGES:
+                # 页数较多时按页分发到多个进程，结果按页码顺序返回；页面图片由各子进程渲染
+                tasks = [(pdf_path, page_num, self.pdf_processor.password, "mixed",
+                          _page_image_path(image_dir, pdf_path, page_num) if image_dir else None)
+                         for page_num in range(page_count)]
+                pages = _map_pages(self.lang, tasks)
+            else:
+                on_page = None
+                if image_dir:
+                    # 页面在读取线程中顺带渲染，JPEG编码和写文件在线程池中进行
+                    executor = ThreadPoolExecutor(max_workers=IMAGE_SAVE_WORKERS, thread_name_prefix="save")
+                    matrices = {}
+                    
+                    def on_page(page_num, page):
+                        futures[page_num] = self._save_page_image(
+                            page, _page_image_path(image_dir, pdf_path, page_num), executor, matrices)
+                
+                # 页面读取、OCR和段落解析以流水线方式并行
+                pages = pipeline = self.pdf_processor.iter_pages(mode="mixed", on_page=on_page)
+
+            for page_num, text_blocks in pages:
+                if executor is not None:
+                    # 该页图片保存完成后再产出
+                    futures.pop(page_num).result()
+                if (page_num + 1) % PROGRESS_EVERY == 0 or page_num + 1 == page_count:
+                    print(f"已处理第{page_num + 1}/{page_count}页")
                 
-                if text_blocks:
-                    # 为每个文本块添加页码信息
-                    for block in text_blocks:
-                        block['page'] = page_num + 1
-                    all_text_blocks.extend(text_blocks)
+                # 为每个文本块添加页码信息
+                for block in text_blocks:
+                    block['page'] = page_num + 1
+                block_count += len(text_blocks)
+                yield page_num, text_blocks
                     
-            print(f"PDF处理完成，共提取{len(all_text_blocks)}个文本块")
-            return all_text_blocks
+            print(f"PDF处理完成，共提取{block_count}个文本块")
             
+        except BrokenProcessPool:
+            # 子进程异常退出，该文件处理失败；丢弃进程池，下一个文件使用新的进程池
+            _discard_page_pool()
+            raise
         finally:
-            self.pdf_processor.close()
+            # 保存图片出错或调用方提前退出时，先关闭流水线，等读取线程和OCR线程结束后才能关闭文档
+            if pipeline is not None:
+                pipeline.close()
+            if executor is not None:
+                executor.shutdown()
+            if close:
+                self.pdf_processor.close()
     
-    def convert_pdf_pages_to_images(self, pdf_path: str, output_dir: str = None) -> List[str]:
+    def convert_pdf_pages_to_images(self, pdf_path: str, output_dir: str = None, doc=None) -> List[str]:
         """将PDF页面转换为图片
         
         Args:
             pdf_path: PDF文件路径
             output_dir: 图片输出目录，如果为None则使用PDF文件所在目录
+            doc: 已打开的PDF文档，为None时打开pdf_path
             
         Returns:
             生成的图片文件路径列表
@@ -429,42 +1068,47 @@ class PDFToExcelProcessor:
         if output_dir is None:
             output_dir = os.path.dirname(pdf_path)
         
-        pdf_filename = os.path.splitext(os.path.basename(pdf_path))[0]
         image_paths = []
+        own_doc = doc is None
         
         try:
-            # 打开PDF文档
-            doc = fitz.open(pdf_path)
-            
+            fitz = _get_fitz()
+            if own_doc:
+                # 打开PDF文档
+                doc = fitz.open(pdf_path)
             print(f"开始转换PDF页面为图片，共{len(doc)}页...")
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # 设置缩放比例以获得高质量图片
-                zoom = 2.0  # 缩放比例
-                mat = fitz.Matrix(zoom, zoom)
-                
-                # 渲染页面为图片
-                pix = page.get_pixmap(matrix=mat)
-                
-                # 生成图片文件名
-                image_filename = f"{pdf_filename}_page_{page_num + 1}.png"
-                image_path = os.path.join(output_dir, image_filename)
-                
-                # 保存图片
-                pix.save(image_path)
-                image_paths.append(image_path)
+            # 同一文档的页面尺寸通常相同，按页面尺寸复用缩放矩阵
+            matrices = {}
+            
+            # 渲染只在当前线程中进行，线程池中只处理像素数据和编码后的字节，不接触MuPDF对象
+            with ThreadPoolExecutor(max_workers=IMAGE_SAVE_WORKERS, thread_name_prefix="save") as executor:
+                futures = []
+                for page_num in range(len(doc)):
+                    image_path = _page_image_path(output_dir, pdf_path, page_num)
+                    futures.append(self._save_page_image(doc[page_num], image_path, executor, matrices))
+                    image_paths.append(image_path)
                 
-                print(f"已保存第{page_num + 1}页: {image_filename}")
+                for page_num, future in enumerate(futures):
+                    future.result()
+                    if (page_num + 1) % PROGRESS_EVERY == 0 or page_num + 1 == len(futures):
+                        print(f"已保存第{page_num + 1}/{len(futures)}页: {os.path.basename(image_paths[page_num])}")
             
-            doc.close()
             print(f"PDF转图片完成，共生成{len(image_paths)}张图片")
             return image_paths
             
         except Exception as e:
             print(f"PDF转图片时出错: {e}")
             return []
+        finally:
+            if own_doc and doc is not None:
+                doc.close()
+    
+    @staticmethod
+    def _save_page_image(page, image_path: str, executor: ThreadPoolExecutor, matrices: Dict):
+        """在当前线程渲染页面，JPEG编码和写文件提交到线程池，返回对应的Future"""
+        pix = _render_page_pixmap(page, matrices)
+        return executor.submit(_encode_jpeg, image_path, pix.samples, pix.width, pix.height, pix.stride)
     
     def process_pdf_to_excel(self, pdf_path: str, template_excel_path: str = None, output_dir: str = None) -> bool:
         """处理PDF并写入Excel
@@ -488,23 +1132,24 @@ class PDFToExcelProcessor:
             if template_excel_path:
                 template_name = os.path.splitext(os.path.basename(template_excel_path))[0]
                 output_excel_path = os.path.join(output_dir, f"{template_name}-{pdf_name}.xlsx")
-                # 复制模板文件
-                shutil.copy2(template_excel_path, output_excel_path)
             else:
+                # 没有模板时在插入图片时直接创建新的Excel文件
                 output_excel_path = os.path.join(output_dir, f"{pdf_name}.xlsx")
-                # 创建新的Excel文件
-                wb = openpyxl.Workbook()
-                wb.save(output_excel_path)
-            
-            # 提取PDF数据
-            text_blocks = self.extract_pdf_data(pdf_path)
             
-            # 转换PDF页面为图片
-            image_paths = self.convert_pdf_pages_to_images(pdf_path, output_dir)
+            # 提取PDF数据的同时转换页面图片，与OCR重叠进行，不再等全部页面识别完才开始转换；
+            # 文本块逐页产出，处理完即释放，不在内存中累积
+            image_paths = []
+            for page_num, _ in self.iter_pdf_data(pdf_path, image_dir=output_dir):
+                image_paths.append(_page_image_path(output_dir, pdf_path, page_num))
+            print(f"PDF转图片完成，共生成{len(image_paths)}张图片")
             
-            # 插入图片到Excel（如果有图片）
-            if image_paths:
-                self._insert_images_to_excel(output_excel_path, image_paths)
+            # 插入图片到Excel；有模板时在缓存的模板工作簿中插入后另存，没有图片时直接复制模板文件
+            if not template_excel_path:
+                self._insert_images_to_excel(output_excel_path, image_paths, new_workbook=True)
+            elif image_paths:
+                self._insert_images_to_excel(output_excel_path, image_paths, template_excel_path=template_excel_path)
+            else:
+                shutil.copy2(template_excel_path, output_excel_path)
             
             print(f"处理完成: {pdf_path} -> {output_excel_path}")
             return True
@@ -513,55 +1158,48 @@ class PDFToExcelProcessor:
             print(f"处理失败: {e}")
             return False
     
-    def _insert_images_to_excel(self, excel_path: str, image_paths: List[str]):
-        """将图片插入到Excel文件中"""
+    def _load_template(self, template_excel_path: str):
+        """从缓存的模板文件内容打开新的工作簿，模板文件变化时重新读取"""
+        st = os.stat(template_excel_path)
+        key = (os.path.abspath(template_excel_path), st.st_mtime_ns, st.st_size)
+        if self._template_cache is None or self._template_cache[:3] != key:
+            with open(template_excel_path, 'rb') as f:
+                self._template_cache = key + (f.read(),)
+        return _get_openpyxl().load_workbook(io.BytesIO(self._template_cache[3]))
+    
+    def _insert_images_to_excel(self, excel_path: str, image_paths: List[str], new_workbook: bool = False,
+                                template_excel_path: str = None):
+        """将图片插入到Excel文件中
+        
+        Args:
+            excel_path: Excel文件路径
+            image_paths: 图片文件路径列表
+            new_workbook: 为True时不读取已有文件，以只写模式创建新的工作簿，一次写出
+            template_excel_path: 不为None时在该模板的工作簿中插入图片后保存到excel_path，模板文件本身不变
+        """
         try:
-            wb = openpyxl.load_workbook(excel_path)
+            openpyxl = _get_openpyxl()
             
-            # 创建或获取图纸工作表
-            if '图纸' not in wb.sheetnames:
+            if new_workbook:
+                # 只写模式不在内存中构建单元格，直接写出XML
+                wb = openpyxl.Workbook(write_only=True)
+                wb.create_sheet('Sheet')
                 drawing_ws = wb.create_sheet('图纸')
             else:
-                drawing_ws = wb['图纸']
-            
-            # 清除现有图片
-            if hasattr(drawing_ws, '_images') and drawing_ws._images:
-                drawing_ws._images.clear()
+                if template_excel_path:
+                    # 直接从模板内容打开，不再先复制模板文件再从输出文件读回
+                    wb = self._load_template(template_excel_path)
+                else:
+                    wb = openpyxl.load_workbook(excel_path)
+                
+                # 创建或获取图纸工作表
+                if '图纸' not in wb.sheetnames:
+                    drawing_ws = wb.create_sheet('图纸')
+                else:
+                    drawing_ws = wb['图纸']
             
             # 插入图片
-            start_row = 2
-            start_col = 2
-            
-            for i, image_path in enumerate(image_paths):
-                if os.path.exists(image_path):
-                    try:
-                        # 创建Excel图片对象
-                        img = ExcelImage(image_path)
-                        
-                        # 调整图片大小
-                        img.width = 600
-                        img.height = 800
-                        
-                        # 计算图片位置
-                        if len(image_paths) <= 2:
-                            col_offset = i * 10
-                            row_offset = 0
-                        else:
-                            col_offset = (i % 2) * 10
-                            row_offset = (i // 2) * 50
-                        
-                        # 设置图片锚点位置
-                        cell_position = drawing_ws.cell(row=start_row + row_offset, 
-                                                       column=start_col + col_offset)
-                        img.anchor = cell_position.coordinate
-                        
-                        # 添加图片到工作表
-                        drawing_ws.add_image(img)
-                        
-                        print(f"  插入图片: {os.path.basename(image_path)}")
-                        
-                    except Exception as e:
-                        print(f"  插入图片 {image_path} 时出错: {e}")
+            _insert_images_into_sheet(drawing_ws, image_paths)
             
             # 保存文件
             wb.save(excel_path)
@@ -571,139 +1209,170 @@ class PDFToExcelProcessor:
             print(f"插入图片到Excel时出错: {e}")
 
 
+# ============================================================================
+# 多进程按文件批量处理
+# ============================================================================
+
+# 子进程内的处理器，在该进程处理的多个文件之间复用
+_batch_processor = None
+
+
+def _init_batch_worker():
+    global PAGE_PROCESSES, _batch_processor
+    # 已经按文件并行，子进程内不再按页启动进程
+    PAGE_PROCESSES = 1
+    # 进程启动时就加载OCR模型，各进程同时加载；失败时留到处理文件时再创建，错误随该文件的结果返回
+    try:
+        processor = PDFToExcelProcessor()
+        processor.ocr_engine.ocr
+        _batch_processor = processor
+    except Exception:
+        _batch_processor = None
+
+
+def _process_pdf_worker(pdf_path: str, template_excel_path: str, output_dir: str) -> bool:
+    global _batch_processor
+    if _batch_processor is None:
+        _batch_processor = PDFToExcelProcessor()
+    return _batch_processor.process_pdf_to_excel(
+        pdf_path=pdf_path,
+        template_excel_path=template_excel_path,
+        output_dir=output_dir
+    )
+
+
+def list_pdf_files(directory: str) -> List[str]:
+    """列出目录中的PDF文件名；文件类型取自目录项缓存，不再逐个stat"""
+    with os.scandir(directory) as it:
+        return [entry.name for entry in it if entry.is_file() and entry.name.lower().endswith('.pdf')]
+
+
+def process_pdfs_in_parallel(pdf_paths: List[str], template_excel_path: str, output_dir: str,
+                             get_processor: Callable[[], 'PDFToExcelProcessor'] = None):
+    """按文件并行处理多个PDF，同时处理的文件数不超过BATCH_PROCESSES
+    
+    Args:
+        get_processor: 在当前进程中处理时调用以获取处理器，为None时新建；
+                       交给子进程处理时不调用，当前进程不加载OCR模型
+    
+    Returns:
+        按完成顺序产出(pdf_path, 是否成功, 异常)的生成器，未出错时异常为None
+    """
+    if BATCH_PROCESSES <= 1 or len(pdf_paths) <= 1:
+        # 只有一个文件时在当前进程中处理，省去子进程加载模型的开销
+        processor = get_processor() if get_processor is not None else PDFToExcelProcessor()
+        for pdf_path in pdf_paths:
+            try:
+                yield pdf_path, processor.process_pdf_to_excel(
+                    pdf_path=pdf_path,
+                    template_excel_path=template_excel_path,
+                    output_dir=output_dir
+                ), None
+            except Exception as e:
+                yield pdf_path, False, e
+        return
+    
+    workers = min(BATCH_PROCESSES, len(pdf_paths))
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context(),
+                                   initializer=_init_batch_worker)
+    try:
+        futures = {
+            executor.submit(_process_pdf_worker, pdf_path, template_excel_path, output_dir): pdf_path
+            for pdf_path in pdf_paths
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], False, e
+    finally:
+        # 调用方中途退出（Ctrl+C或异常）时取消还没开始的文件，只等待正在处理的文件
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 # ============================================================================
 # 图片验证和重新插入功能
 # ============================================================================
 
-def find_image_for_excel(excel_filename: str, pdf_dir: str) -> List[str]:
-    """根据Excel文件名找到对应的PNG图片文件"""
-    # 从Excel文件名中提取PDF基础名称
+# 从Excel文件名中提取PDF基础名称，匹配类似 "45-34-1080__PN0012023_ACO" 的模式
+_PDF_BASE_RE = re.compile(r'(\d{2}-\d{2}-\d{4}__PN\d+_ACO)')
+
+
+def find_image_for_excel(excel_filename: str, pdf_dir: str, entries: Dict[str, str] = None) -> List[str]:
+    """根据Excel文件名找到对应的页面图片文件（JPEG，兼容旧版本生成的PNG）
+    
+    Args:
+        excel_filename: Excel文件名
+        pdf_dir: 图片所在目录
+        entries: 目录中的{文件名: 路径}，批量查找时预先扫描一次目录传入，为None时逐个检查文件是否存在
+    """
     # 例如: "浙江锦康FAI 报告-浙江斐凌工具有限公司-45-34-1080__PN0012023_ACO LABEL -20250902.xlsx"
     # 提取: "45-34-1080__PN0012023_ACO"
-    
-    # 使用正则表达式匹配PDF基础名称模式
-    # 匹配类似 "45-34-1080__PN0012023_ACO" 的模式
-    pattern = r'(\d{2}-\d{2}-\d{4}__PN\d+_ACO)'
-    match = re.search(pattern, excel_filename)
+    match = _PDF_BASE_RE.search(excel_filename)
     
     if match:
         pdf_base = match.group(1)
-        # 查找对应的PNG文件
-        png_filename = f"{pdf_base}_page_1.png"
-        png_path = os.path.join(pdf_dir, png_filename)
-        
-        if os.path.exists(png_path):
-            return [png_path]
-        else:
-            print(f"警告: 找不到图片文件 {png_path}")
+        # 查找对应的图片文件
+        for ext in ('.jpg', '.png'):
+            image_name = f"{pdf_base}_page_1{ext}"
+            if entries is not None:
+                if image_name in entries:
+                    return [entries[image_name]]
+            else:
+                image_path = os.path.join(pdf_dir, image_name)
+                if os.path.exists(image_path):
+                    return [image_path]
+        print(f"警告: 找不到图片文件 {os.path.join(pdf_dir, pdf_base + '_page_1.jpg')}")
     else:
         print(f"警告: 无法从文件名 {excel_filename} 中提取PDF基础名称")
     
     return []
 
 
-def verify_and_reinsert_images(excel_path: str, image_paths: List[str]) -> bool:
-    """验证Excel文件中的图片是否存在，如果不存在则重新插入"""
+def verify_and_reinsert_images(excel_path: str, image_paths: List[str], log=print) -> bool:
+    """验证Excel文件中的图片是否存在，如果不存在则重新插入；log为输出函数，批量并行处理时用来收集每个文件的输出"""
     try:
-        print(f"\n检查文件: {os.path.basename(excel_path)}")
-        
-        # 重新打开Excel文件检查图片
-        wb = openpyxl.load_workbook(excel_path)
-        
-        if '图纸' not in wb.sheetnames:
-            print("  未找到'图纸'工作表，需要重新插入图片")
-            needs_reinsert = True
-        else:
-            drawing_ws = wb['图纸']
-            # 检查是否有图片
-            has_images = hasattr(drawing_ws, '_images') and len(drawing_ws._images) > 0
-            
-            if not has_images:
-                print("  '图纸'工作表中没有图片，需要重新插入")
-                needs_reinsert = True
-            else:
-                print(f"  '图纸'工作表中已有 {len(drawing_ws._images)} 张图片")
-                needs_reinsert = False
-        
-        wb.close()
+        log(f"\n检查文件: {os.path.basename(excel_path)}")
         
-        # 如果需要重新插入图片
-        if needs_reinsert and image_paths:
-            print("  开始重新插入图片...")
-            
-            # 重新打开文件进行编辑
-            wb = openpyxl.load_workbook(excel_path)
-            
-            # 创建或获取图纸工作表
+        # 只打开一次工作簿，检查和重新插入都在同一个对象上进行
+        wb = _get_openpyxl().load_workbook(excel_path)
+        try:
             if '图纸' not in wb.sheetnames:
-                drawing_ws = wb.create_sheet('图纸')
+                log("  未找到'图纸'工作表，需要重新插入图片")
+                drawing_ws = None
             else:
                 drawing_ws = wb['图纸']
+                # 检查是否有图片
+                if getattr(drawing_ws, '_images', None):
+                    log(f"  '图纸'工作表中已有 {len(drawing_ws._images)} 张图片")
+                    return True
+                log("  '图纸'工作表中没有图片，需要重新插入")
             
-            # 清除现有图片
-            if hasattr(drawing_ws, '_images') and drawing_ws._images:
-                drawing_ws._images.clear()
+            if not image_paths:
+                return True
             
-            # 插入图片
-            start_row = 2
-            start_col = 2
+            log("  开始重新插入图片...")
             
-            for i, image_path in enumerate(image_paths):
-                if os.path.exists(image_path):
-                    try:
-                        # 创建Excel图片对象
-                        img = ExcelImage(image_path)
-                        
-                        # 调整图片大小
-                        img.width = 600
-                        img.height = 800
-                        
-                        # 计算图片位置
-                        if len(image_paths) <= 2:
-                            col_offset = i * 10
-                            row_offset = 0
-                        else:
-                            col_offset = (i % 2) * 10
-                            row_offset = (i // 2) * 50
-                        
-                        # 设置图片锚点位置
-                        cell_position = drawing_ws.cell(row=start_row + row_offset, 
-                                                       column=start_col + col_offset)
-                        img.anchor = cell_position.coordinate
-                        
-                        # 添加图片到工作表
-                        drawing_ws.add_image(img)
-                        
-                        print(f"    插入图片: {os.path.basename(image_path)}")
-                        
-                    except Exception as e:
-                        print(f"    插入图片 {image_path} 时出错: {e}")
+            # 创建图纸工作表
+            if drawing_ws is None:
+                drawing_ws = wb.create_sheet('图纸')
             
-            # 保存文件
-            wb.save(excel_path)
-            print("  图片重新插入完成")
+            # 插入图片
+            inserted = _insert_images_into_sheet(drawing_ws, image_paths, indent="    ", log=log)
             
-            # 再次验证
-            wb = openpyxl.load_workbook(excel_path)
-            if '图纸' in wb.sheetnames:
-                drawing_ws = wb['图纸']
-                if hasattr(drawing_ws, '_images') and len(drawing_ws._images) > 0:
-                    print(f"  验证成功: 图片已正确插入 ({len(drawing_ws._images)} 张)")
-                    wb.close()
-                    return True
-                else:
-                    print("  验证失败: 图片插入后仍然不存在")
-                    wb.close()
-                    return False
-            else:
-                print("  验证失败: '图纸'工作表不存在")
-                wb.close()
+            # 保存后内存中的图片列表即为文件中的内容，不必重新打开验证
+            if not inserted:
+                log("  验证失败: 没有图片被插入")
                 return False
-        
-        return True
+            
+            wb.save(excel_path)
+            log(f"  图片重新插入完成 ({inserted} 张)")
+            return True
+        finally:
+            wb.close()
         
     except Exception as e:
-        print(f"验证和重新插入图片时出错: {e}")
+        log(f"验证和重新插入图片时出错: {e}")
         return False
 
 
@@ -715,8 +1384,12 @@ def batch_verify_and_reinsert(output_dir: str):
         print(f"输出目录不存在: {output_dir}")
         return
     
+    # 扫描一次目录，查找图片时不再逐个检查文件是否存在
+    with os.scandir(output_dir) as it:
+        entries = {entry.name: entry.path for entry in it if entry.is_file()}
+    
     # 获取所有Excel文件
-    excel_files = [f for f in os.listdir(output_dir) if f.lower().endswith(('.xlsx', '.xls'))]
+    excel_files = [name for name in entries if name.lower().endswith(('.xlsx', '.xls'))]
     
     if not excel_files:
         print("未找到Excel文件")
@@ -725,27 +1398,28 @@ def batch_verify_and_reinsert(output_dir: str):
     print(f"找到 {len(excel_files)} 个Excel文件")
     
     success_count = 0
+    tasks = []
     
     for excel_file in excel_files:
-        excel_path = os.path.join(output_dir, excel_file)
-        
-        # 查找对应的图片文件
-        image_paths = find_image_for_excel(excel_file, output_dir)
+        # 查找对应的图片文件，返回的都是扫描时存在的文件
+        image_paths = find_image_for_excel(excel_file, output_dir, entries)
         
         if not image_paths:
             print(f"跳过 {excel_file}: 未找到对应的图片文件")
             continue
         
-        # 检查图片文件是否存在
-        existing_images = [img for img in image_paths if os.path.exists(img)]
-        
-        if not existing_images:
-            print(f"跳过 {excel_file}: 对应的图片文件不存在")
-            continue
-        
-        # 验证并重新插入图片
-        if verify_and_reinsert_images(excel_path, existing_images):
-            success_count += 1
+        tasks.append((entries[excel_file], image_paths))
+    
+    def verify(task):
+        lines = []
+        return verify_and_reinsert_images(*task, log=lines.append), lines
+    
+    # 验证并重新插入图片：多个文件同时处理，每个文件的输出收集后按顺序整体打印，不会相互穿插
+    with ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="verify") as executor:
+        for success, lines in executor.map(verify, tasks):
+            print("\n".join(lines))
+            if success:
+                success_count += 1
     
     print(f"\n批量验证和重新插入完成！成功处理: {success_count}/{len(excel_files)}")
 
@@ -754,334 +1428,399 @@ def batch_verify_and_reinsert(output_dir: str):
 # GUI界面类
 # ============================================================================
 
-if GUI_AVAILABLE:
-    class PDFProcessorGUI:
-        def __init__(self, root):
-            self.root = root
-            self.root.title("PDF处理工具 - 完整版")
-            self.root.geometry("900x700")
-            self.root.resizable(True, True)
-            
-            # 设置样式
-            style = ttk.Style()
-            style.theme_use('clam')
-            
-            # 变量
-            self.pdf_file_path = tk.StringVar()
-            self.template_file_path = tk.StringVar()
-            self.output_dir_path = tk.StringVar()
-            self.processing_mode = tk.StringVar(value="single")
-            
-            # 设置默认输出目录
-            self.output_dir_path.set(os.path.join(os.getcwd(), "output"))
-            
-            self.create_widgets()
-            
-        def create_widgets(self):
-            # 主框架
-            main_frame = ttk.Frame(self.root, padding="10")
-            main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-            
-            # 配置网格权重
-            self.root.columnconfigure(0, weight=1)
-            self.root.rowconfigure(0, weight=1)
-            main_frame.columnconfigure(1, weight=1)
-            
-            # 标题
-            title_label = ttk.Label(main_frame, text="PDF处理工具 - 完整版", font=('Arial', 16, 'bold'))
-            title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
-            
-            # 处理模式选择
-            mode_frame = ttk.LabelFrame(main_frame, text="处理模式", padding="10")
-            mode_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-            
-            ttk.Radiobutton(mode_frame, text="单文件处理", variable=self.processing_mode, 
-                           value="single", command=self.on_mode_change).grid(row=0, column=0, padx=(0, 20))
-            ttk.Radiobutton(mode_frame, text="批量处理", variable=self.processing_mode, 
-                           value="batch", command=self.on_mode_change).grid(row=0, column=1)
-            
-            # 文件选择区域
-            file_frame = ttk.LabelFrame(main_frame, text="文件选择", padding="10")
-            file_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-            file_frame.columnconfigure(1, weight=1)
-            
-            # PDF文件选择
-            self.pdf_label = ttk.Label(file_frame, text="PDF文件:")
-            self.pdf_label.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
-            
-            self.pdf_entry = ttk.Entry(file_frame, textvariable=self.pdf_file_path, width=50)
-            self.pdf_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 5), pady=(0, 5))
-            
-            self.pdf_button = ttk.Button(file_frame, text="浏览", command=self.browse_pdf_file)
-            self.pdf_button.grid(row=0, column=2, pady=(0, 5))
-            
-            # Excel模板文件选择
-            ttk.Label(file_frame, text="Excel模板:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
-            
-            ttk.Entry(file_frame, textvariable=self.template_file_path, width=50).grid(
-                row=1, column=1, sticky=(tk.W, tk.E), padx=(10, 5), pady=(0, 5))
-            
-            ttk.Button(file_frame, text="浏览", command=self.browse_template_file).grid(
-                row=1, column=2, pady=(0, 5))
-            
-            # 输出目录选择
-            ttk.Label(file_frame, text="输出目录:").grid(row=2, column=0, sticky=tk.W)
-            
-            ttk.Entry(file_frame, textvariable=self.output_dir_path, width=50).grid(
-                row=2, column=1, sticky=(tk.W, tk.E), padx=(10, 5))
-            
-            ttk.Button(file_frame, text="浏览", command=self.browse_output_dir).grid(
-                row=2, column=2)
-            
-            # 操作按钮区域
-            button_frame = ttk.Frame(main_frame)
-            button_frame.grid(row=3, column=0, columnspan=3, pady=20)
-            
-            self.process_button = ttk.Button(button_frame, text="开始处理", 
-                                           command=self.start_processing, style='Accent.TButton')
-            self.process_button.grid(row=0, column=0, padx=(0, 10))
-            
-            self.verify_button = ttk.Button(button_frame, text="验证并重插入图片", 
-                                          command=self.start_verification)
-            self.verify_button.grid(row=0, column=1, padx=(0, 10))
-            
-            ttk.Button(button_frame, text="清空日志", command=self.clear_log).grid(row=0, column=2)
-            
-            # 进度条
-            self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
-            self.progress.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-            
-            # 日志显示区域
-            log_frame = ttk.LabelFrame(main_frame, text="处理日志", padding="10")
-            log_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
-            log_frame.columnconfigure(0, weight=1)
-            log_frame.rowconfigure(0, weight=1)
-            main_frame.rowconfigure(5, weight=1)
-            
-            self.log_text = scrolledtext.ScrolledText(log_frame, height=15, width=80)
-            self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-            
-            # 初始化界面状态
-            self.on_mode_change()
-            
-        def on_mode_change(self):
-            """处理模式改变时的界面更新"""
-            if self.processing_mode.get() == "batch":
-                # 批量模式下禁用PDF文件选择
-                self.pdf_entry.config(state='disabled')
-                self.pdf_button.config(state='disabled')
-                self.pdf_label.config(text="PDF目录: (批量模式)")
-                self.log("切换到批量处理模式")
-            else:
-                # 单文件模式下启用PDF文件选择
-                self.pdf_entry.config(state='normal')
-                self.pdf_button.config(state='normal')
-                self.pdf_label.config(text="PDF文件:")
-                self.log("切换到单文件处理模式")
-        
-        def browse_pdf_file(self):
-            """浏览PDF文件"""
-            filename = filedialog.askopenfilename(
-                title="选择PDF文件",
-                filetypes=[("PDF文件", "*.pdf"), ("所有文件", "*.*")]
-            )
-            if filename:
-                self.pdf_file_path.set(filename)
-                self.log(f"选择PDF文件: {filename}")
-        
-        def browse_template_file(self):
-            """浏览Excel模板文件"""
-            filename = filedialog.askopenfilename(
-                title="选择Excel模板文件",
-                filetypes=[("Excel文件", "*.xlsx;*.xls"), ("所有文件", "*.*")]
-            )
-            if filename:
-                self.template_file_path.set(filename)
-                self.log(f"选择Excel模板: {filename}")
-        
-        def browse_output_dir(self):
-            """浏览输出目录"""
-            dirname = filedialog.askdirectory(title="选择输出目录")
-            if dirname:
-                self.output_dir_path.set(dirname)
-                self.log(f"设置输出目录: {dirname}")
-        
-        def log(self, message):
-            """添加日志信息"""
-            self.log_text.insert(tk.END, f"{message}\n")
-            self.log_text.see(tk.END)
-            self.root.update_idletasks()
-        
-        def clear_log(self):
-            """清空日志"""
-            self.log_text.delete(1.0, tk.END)
-        
-        def validate_inputs(self):
-            """验证输入参数"""
-            if self.processing_mode.get() == "single":
-                if not self.pdf_file_path.get():
-                    messagebox.showerror("错误", "请选择PDF文件")
-                    return False
-                if not os.path.exists(self.pdf_file_path.get()):
-                    messagebox.showerror("错误", "PDF文件不存在")
-                    return False
-            
-            if not self.template_file_path.get():
-                messagebox.showerror("错误", "请选择Excel模板文件")
-                return False
-            
-            if not os.path.exists(self.template_file_path.get()):
-                messagebox.showerror("错误", "Excel模板文件不存在")
+class PDFProcessorGUI:
+    # 日志刷新间隔（毫秒），期间的日志合并为一次插入
+    LOG_FLUSH_MS = 50
+    # 日志框最多保留的行数，超出后删除最早的行，行数过多时Text控件重绘明显变慢
+    LOG_MAX_LINES = 5000
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("PDF处理工具 - 完整版")
+        self.root.geometry("900x700")
+        self.root.resizable(True, True)
+        
+        # 设置样式
+        style = ttk.Style()
+        style.theme_use('clam')
+        
+        # 变量
+        self.pdf_file_path = tk.StringVar()
+        self.template_file_path = tk.StringVar()
+        self.output_dir_path = tk.StringVar()
+        self.processing_mode = tk.StringVar(value="single")
+        
+        # 处理器在多次处理之间复用，首次处理时创建
+        self.processor = None
+        
+        # 文件对话框从上次选择的目录打开，不从默认位置（可能是很慢的网络位置）开始枚举
+        self._last_dir = os.getcwd()
+        
+        # 待显示的日志和待执行的界面操作，任何线程都可以追加，由界面线程定时取出；
+        # 后台线程不直接调用Tk
+        self._log_queue = deque()
+        self._ui_calls = deque()
+        
+        # 处理和验证任务都交给同一个常驻后台线程依次执行，不再每次点击新建线程
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._run_jobs, name="gui-worker", daemon=True)
+        self._worker.start()
+        
+        # 设置默认输出目录
+        self.output_dir_path.set(os.path.join(os.getcwd(), "output"))
+        
+        self.create_widgets()
+        self._schedule_log_flush()
+    
+    def _run_jobs(self):
+        """后台线程：依次执行队列中的任务"""
+        while True:
+            job = self._jobs.get()
+            try:
+                job()
+            except Exception as e:
+                # 不让异常结束后台线程，之后的任务还要执行
+                self.log(f"后台任务出错: {str(e)}")
+            finally:
+                self._jobs.task_done()
+        
+    def create_widgets(self):
+        # 主框架
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # 配置网格权重
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+        # 标题
+        title_label = ttk.Label(main_frame, text="PDF处理工具 - 完整版", font=('Arial', 16, 'bold'))
+        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
+        
+        # 处理模式选择
+        mode_frame = ttk.LabelFrame(main_frame, text="处理模式", padding="10")
+        mode_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Radiobutton(mode_frame, text="单文件处理", variable=self.processing_mode, 
+                       value="single", command=self.on_mode_change).grid(row=0, column=0, padx=(0, 20))
+        ttk.Radiobutton(mode_frame, text="批量处理", variable=self.processing_mode, 
+                       value="batch", command=self.on_mode_change).grid(row=0, column=1)
+        
+        # 文件选择区域
+        file_frame = ttk.LabelFrame(main_frame, text="文件选择", padding="10")
+        file_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        file_frame.columnconfigure(1, weight=1)
+        
+        # PDF文件选择
+        self.pdf_label = ttk.Label(file_frame, text="PDF文件:")
+        self.pdf_label.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        
+        self.pdf_entry = ttk.Entry(file_frame, textvariable=self.pdf_file_path, width=50)
+        self.pdf_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 5), pady=(0, 5))
+        
+        self.pdf_button = ttk.Button(file_frame, text="浏览", command=self.browse_pdf_file)
+        self.pdf_button.grid(row=0, column=2, pady=(0, 5))
+        
+        # Excel模板文件选择
+        ttk.Label(file_frame, text="Excel模板:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Entry(file_frame, textvariable=self.template_file_path, width=50).grid(
+            row=1, column=1, sticky=(tk.W, tk.E), padx=(10, 5), pady=(0, 5))
+        
+        ttk.Button(file_frame, text="浏览", command=self.browse_template_file).grid(
+            row=1, column=2, pady=(0, 5))
+        
+        # 输出目录选择
+        ttk.Label(file_frame, text="输出目录:").grid(row=2, column=0, sticky=tk.W)
+        
+        ttk.Entry(file_frame, textvariable=self.output_dir_path, width=50).grid(
+            row=2, column=1, sticky=(tk.W, tk.E), padx=(10, 5))
+        
+        ttk.Button(file_frame, text="浏览", command=self.browse_output_dir).grid(
+            row=2, column=2)
+        
+        # 操作按钮区域
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=3, column=0, columnspan=3, pady=20)
+        
+        self.process_button = ttk.Button(button_frame, text="开始处理", 
+                                       command=self.start_processing, style='Accent.TButton')
+        self.process_button.grid(row=0, column=0, padx=(0, 10))
+        
+        self.verify_button = ttk.Button(button_frame, text="验证并重插入图片", 
+                                      command=self.start_verification)
+        self.verify_button.grid(row=0, column=1, padx=(0, 10))
+        
+        ttk.Button(button_frame, text="清空日志", command=self.clear_log).grid(row=0, column=2)
+        
+        # 进度条
+        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        self.progress.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        # 日志显示区域
+        log_frame = ttk.LabelFrame(main_frame, text="处理日志", padding="10")
+        log_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+        main_frame.rowconfigure(5, weight=1)
+        
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, width=80)
+        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # 初始化界面状态
+        self.on_mode_change()
+        
+    def on_mode_change(self):
+        """处理模式改变时的界面更新"""
+        if self.processing_mode.get() == "batch":
+            # 批量模式下禁用PDF文件选择
+            self.pdf_entry.config(state='disabled')
+            self.pdf_button.config(state='disabled')
+            self.pdf_label.config(text="PDF目录: (批量模式)")
+            self.log("切换到批量处理模式")
+        else:
+            # 单文件模式下启用PDF文件选择
+            self.pdf_entry.config(state='normal')
+            self.pdf_button.config(state='normal')
+            self.pdf_label.config(text="PDF文件:")
+            self.log("切换到单文件处理模式")
+    
+    def browse_pdf_file(self):
+        """浏览PDF文件"""
+        filename = filedialog.askopenfilename(
+            parent=self.root,
+            title="选择PDF文件",
+            initialdir=self._last_dir,
+            filetypes=[("PDF文件", "*.pdf"), ("所有文件", "*.*")]
+        )
+        if filename:
+            self._last_dir = os.path.dirname(filename)
+            self.pdf_file_path.set(filename)
+            self.log(f"选择PDF文件: {filename}")
+    
+    def browse_template_file(self):
+        """浏览Excel模板文件"""
+        filename = filedialog.askopenfilename(
+            parent=self.root,
+            title="选择Excel模板文件",
+            initialdir=self._last_dir,
+            filetypes=[("Excel文件", "*.xlsx;*.xls"), ("所有文件", "*.*")]
+        )
+        if filename:
+            self._last_dir = os.path.dirname(filename)
+            self.template_file_path.set(filename)
+            self.log(f"选择Excel模板: {filename}")
+    
+    def browse_output_dir(self):
+        """浏览输出目录"""
+        dirname = filedialog.askdirectory(parent=self.root, title="选择输出目录", initialdir=self._last_dir)
+        if dirname:
+            self._last_dir = dirname
+            self.output_dir_path.set(dirname)
+            self.log(f"设置输出目录: {dirname}")
+    
+    def log(self, message):
+        """添加日志信息；只放入队列，由界面线程定时批量显示，可以在后台线程中调用"""
+        self._log_queue.append(message)
+    
+    def _schedule_log_flush(self):
+        self.root.after(self.LOG_FLUSH_MS, self._flush_logs)
+    
+    def _flush_logs(self):
+        """取出队列中的全部日志，一次插入文本框；无论是否出错都重新安排下一次刷新"""
+        try:
+            lines = []
+            while self._log_queue:
+                lines.append(self._log_queue.popleft())
+            if lines:
+                # 用户向上滚动查看时不跳到末尾
+                at_tail = self.log_text.yview()[1] >= 1.0
+                self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+                line_count = int(self.log_text.index('end-1c').split('.')[0])
+                if line_count > self.LOG_MAX_LINES:
+                    self.log_text.delete('1.0', f'{line_count - self.LOG_MAX_LINES + 1}.0')
+                if at_tail:
+                    self.log_text.see(tk.END)
+            while self._ui_calls:
+                func, args = self._ui_calls.popleft()
+                # 单个回调出错不能影响队列中其余的回调
+                try:
+                    func(*args)
+                except Exception as e:
+                    self.log(f"界面回调出错: {e}")
+                    import traceback
+                    traceback.print_exc()
+        finally:
+            self._schedule_log_flush()
+    
+    def _call_in_ui(self, func, *args):
+        """在界面线程中执行func(*args)，用于后台线程弹出对话框和恢复界面状态"""
+        self._ui_calls.append((func, args))
+    
+    def clear_log(self):
+        """清空日志"""
+        self.log_text.delete(1.0, tk.END)
+    
+    def validate_inputs(self):
+        """验证输入参数"""
+        if self.processing_mode.get() == "single":
+            if not self.pdf_file_path.get():
+                messagebox.showerror("错误", "请选择PDF文件")
                 return False
-            
-            if not self.output_dir_path.get():
-                messagebox.showerror("错误", "请设置输出目录")
+            if not os.path.exists(self.pdf_file_path.get()):
+                messagebox.showerror("错误", "PDF文件不存在")
                 return False
-            
-            return True
         
-        def start_processing(self):
-            """开始处理"""
-            if not self.validate_inputs():
-                return
+        if not self.template_file_path.get():
+            messagebox.showerror("错误", "请选择Excel模板文件")
+            return False
+        
+        if not os.path.exists(self.template_file_path.get()):
+            messagebox.showerror("错误", "Excel模板文件不存在")
+            return False
+        
+        if not self.output_dir_path.get():
+            messagebox.showerror("错误", "请设置输出目录")
+            return False
+        
+        return True
+    
+    def start_processing(self):
+        """开始处理"""
+        if not self.validate_inputs():
+            return
+        
+        # 禁用按钮并显示进度条
+        self.process_button.config(state='disabled')
+        self.progress.start()
+        
+        # 在界面线程中读取参数，交给后台线程执行处理
+        args = (self.processing_mode.get(), self.pdf_file_path.get(),
+                self.template_file_path.get(), self.output_dir_path.get())
+        self._jobs.put(lambda: self.process_files(*args))
+    
+    def get_processor(self):
+        """获取共用的处理器，首次调用时创建"""
+        if self.processor is None:
+            self.processor = PDFToExcelProcessor()
+        return self.processor
+    
+    def process_files(self, mode, pdf_path, template_path, output_dir):
+        """处理文件的主要逻辑，在后台线程中执行"""
+        try:
             
-            # 禁用按钮并显示进度条
-            self.process_button.config(state='disabled')
-            self.progress.start()
+            # 确保输出目录存在
+            os.makedirs(output_dir, exist_ok=True)
             
-            # 在新线程中执行处理
-            thread = threading.Thread(target=self.process_files)
-            thread.daemon = True
-            thread.start()
-        
-        def process_files(self):
-            """处理文件的主要逻辑"""
-            try:
-                output_dir = self.output_dir_path.get()
-                template_path = self.template_file_path.get()
+            if mode == "single":
+                # 单文件处理
+                self.log(f"开始处理单个PDF文件: {pdf_path}")
                 
-                # 确保输出目录存在
-                os.makedirs(output_dir, exist_ok=True)
-                
-                if self.processing_mode.get() == "single":
-                    # 单文件处理
-                    pdf_path = self.pdf_file_path.get()
-                    self.log(f"开始处理单个PDF文件: {pdf_path}")
-                    
-                    processor = PDFToExcelProcessor()
-                    success = processor.process_pdf_to_excel(
-                        pdf_path=pdf_path,
-                        template_excel_path=template_path,
-                        output_dir=output_dir
-                    )
-                    
-                    if success:
-                        self.log("PDF处理完成！")
-                        messagebox.showinfo("成功", "PDF处理完成！")
-                    else:
-                        self.log("PDF处理失败！")
-                        messagebox.showerror("错误", "PDF处理失败！")
+                success = self.get_processor().process_pdf_to_excel(
+                    pdf_path=pdf_path,
+                    template_excel_path=template_path,
+                    output_dir=output_dir
+                )
                 
+                if success:
+                    self.log("PDF处理完成！")
+                    self._call_in_ui(messagebox.showinfo, "成功", "PDF处理完成！")
                 else:
-                    # 批量处理
-                    self.log("开始批量处理PDF文件...")
-                    
-                    # 查找pdf_process_ing目录
-                    pdf_dir = os.path.join(os.getcwd(), "pdf_process_ing")
-                    if not os.path.exists(pdf_dir):
-                        self.log(f"未找到pdf_process_ing目录: {pdf_dir}")
-                        messagebox.showerror("错误", f"未找到pdf_process_ing目录: {pdf_dir}")
-                        return
-                    
-                    # 获取所有PDF文件
-                    pdf_files = [f for f in os.listdir(pdf_dir) if f.lower().endswith('.pdf')]
-                    if not pdf_files:
-                        self.log("pdf_process_ing目录中没有找到PDF文件")
-                        messagebox.showwarning("警告", "pdf_process_ing目录中没有找到PDF文件")
-                        return
-                    
-                    self.log(f"找到 {len(pdf_files)} 个PDF文件")
-                    
-                    processor = PDFToExcelProcessor()
-                    success_count = 0
-                    
-                    for i, pdf_file in enumerate(pdf_files, 1):
-                        pdf_path = os.path.join(pdf_dir, pdf_file)
-                        self.log(f"处理第 {i}/{len(pdf_files)} 个文件: {pdf_file}")
-                        
-                        try:
-                            success = processor.process_pdf_to_excel(
-                                pdf_path=pdf_path,
-                                template_excel_path=template_path,
-                                output_dir=output_dir
-                            )
-                            
-                            if success:
-                                success_count += 1
-                                self.log(f"✓ {pdf_file} 处理成功")
-                            else:
-                                self.log(f"✗ {pdf_file} 处理失败")
-                        
-                        except Exception as e:
-                            self.log(f"✗ {pdf_file} 处理出错: {str(e)}")
-                    
-                    self.log(f"批量处理完成！成功: {success_count}/{len(pdf_files)}")
-                    messagebox.showinfo("完成", f"批量处理完成！\n成功: {success_count}/{len(pdf_files)}")
-            
-            except Exception as e:
-                error_msg = f"处理过程中发生错误: {str(e)}"
-                self.log(error_msg)
-                messagebox.showerror("错误", error_msg)
-            
-            finally:
-                # 恢复界面状态
-                self.root.after(0, self.processing_finished)
-        
-        def start_verification(self):
-            """开始验证并重插入图片"""
-            if not self.output_dir_path.get():
-                messagebox.showerror("错误", "请设置输出目录")
-                return
+                    self.log("PDF处理失败！")
+                    self._call_in_ui(messagebox.showerror, "错误", "PDF处理失败！")
             
-            # 禁用按钮并显示进度条
-            self.verify_button.config(state='disabled')
-            self.progress.start()
-            
-            # 在新线程中执行验证
-            thread = threading.Thread(target=self.verify_images)
-            thread.daemon = True
-            thread.start()
-        
-        def verify_images(self):
-            """验证并重插入图片的主要逻辑"""
-            try:
-                output_dir = self.output_dir_path.get()
-                self.log("开始验证并重插入图片...")
+            else:
+                # 批量处理
+                self.log("开始批量处理PDF文件...")
+                
+                # 查找pdf_process_ing目录
+                pdf_dir = os.path.join(os.getcwd(), "pdf_process_ing")
+                if not os.path.exists(pdf_dir):
+                    self.log(f"未找到pdf_process_ing目录: {pdf_dir}")
+                    self._call_in_ui(messagebox.showerror, "错误", f"未找到pdf_process_ing目录: {pdf_dir}")
+                    return
+                
+                # 获取所有PDF文件
+                pdf_files = list_pdf_files(pdf_dir)
+                if not pdf_files:
+                    self.log("pdf_process_ing目录中没有找到PDF文件")
+                    self._call_in_ui(messagebox.showwarning, "警告", "pdf_process_ing目录中没有找到PDF文件")
+                    return
                 
-                # 调用批量验证函数
-                batch_verify_and_reinsert(output_dir)
+                self.log(f"找到 {len(pdf_files)} 个PDF文件，同时处理 {min(BATCH_PROCESSES, len(pdf_files))} 个")
                 
-                self.log("图片验证和重插入完成！")
-                messagebox.showinfo("成功", "图片验证和重插入完成！")
+                success_count = 0
+                pdf_paths = [os.path.join(pdf_dir, pdf_file) for pdf_file in pdf_files]
+                
+                # 多个文件在子进程中并行处理，按完成顺序输出结果
+                for i, (pdf_path, success, error) in enumerate(
+                        process_pdfs_in_parallel(pdf_paths, template_path, output_dir,
+                                                 get_processor=self.get_processor), 1):
+                    pdf_file = os.path.basename(pdf_path)
+                    if error is not None:
+                        self.log(f"✗ [{i}/{len(pdf_files)}] {pdf_file} 处理出错: {str(error)}")
+                    elif success:
+                        success_count += 1
+                        self.log(f"✓ [{i}/{len(pdf_files)}] {pdf_file} 处理成功")
+                    else:
+                        self.log(f"✗ [{i}/{len(pdf_files)}] {pdf_file} 处理失败")
+                
+                self.log(f"批量处理完成！成功: {success_count}/{len(pdf_files)}")
+                self._call_in_ui(messagebox.showinfo, "完成", f"批量处理完成！\n成功: {success_count}/{len(pdf_files)}")
+        
+        except Exception as e:
+            error_msg = f"处理过程中发生错误: {str(e)}"
+            self.log(error_msg)
+            self._call_in_ui(messagebox.showerror, "错误", error_msg)
+        
+        finally:
+            # 恢复界面状态
+            self._call_in_ui(self.processing_finished)
+    
+    def start_verification(self):
+        """开始验证并重插入图片"""
+        if not self.output_dir_path.get():
+            messagebox.showerror("错误", "请设置输出目录")
+            return
+        
+        # 禁用按钮并显示进度条
+        self.verify_button.config(state='disabled')
+        self.progress.start()
+        
+        # 交给后台线程执行验证，正在处理时排在处理之后
+        output_dir = self.output_dir_path.get()
+        self._jobs.put(lambda: self.verify_images(output_dir))
+    
+    def verify_images(self, output_dir):
+        """验证并重插入图片的主要逻辑，在后台线程中执行"""
+        try:
+            self.log("开始验证并重插入图片...")
             
-            except Exception as e:
-                error_msg = f"验证过程中发生错误: {str(e)}"
-                self.log(error_msg)
-                messagebox.showerror("错误", error_msg)
+            # 调用批量验证函数
+            batch_verify_and_reinsert(output_dir)
             
-            finally:
-                # 恢复界面状态
-                self.root.after(0, self.verification_finished)
+            self.log("图片验证和重插入完成！")
+            self._call_in_ui(messagebox.showinfo, "成功", "图片验证和重插入完成！")
         
-        def processing_finished(self):
-            """处理完成后的界面恢复"""
-            self.progress.stop()
-            self.process_button.config(state='normal')
+        except Exception as e:
+            error_msg = f"验证过程中发生错误: {str(e)}"
+            self.log(error_msg)
+            self._call_in_ui(messagebox.showerror, "错误", error_msg)
         
-        def verification_finished(self):
-            """验证完成后的界面恢复"""
-            self.progress.stop()
-            self.verify_button.config(state='normal')
+        finally:
+            # 恢复界面状态
+            self._call_in_ui(self.verification_finished)
+    
+    def processing_finished(self):
+        """处理完成后的界面恢复"""
+        self.progress.stop()
+        self.process_button.config(state='normal')
+    
+    def verification_finished(self):
+        """验证完成后的界面恢复"""
+        self.progress.stop()
+        self.verify_button.config(state='normal')
 
 
 # ============================================================================
@@ -1110,36 +1849,28 @@ def process_all_pdfs_in_directory(pdf_directory: str, template_excel_path: str,
     os.makedirs(output_dir, exist_ok=True)
     
     # 获取所有PDF文件
-    pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
+    pdf_files = list_pdf_files(pdf_directory)
     
     if not pdf_files:
         print(f"在目录 {pdf_directory} 中未找到PDF文件")
         return 0
     
-    print(f"找到 {len(pdf_files)} 个PDF文件，开始批量处理...")
+    print(f"找到 {len(pdf_files)} 个PDF文件，同时处理 {min(BATCH_PROCESSES, len(pdf_files))} 个，开始批量处理...")
     
-    processor = PDFToExcelProcessor()
     success_count = 0
+    pdf_paths = [os.path.join(pdf_directory, pdf_file) for pdf_file in pdf_files]
     
-    for i, pdf_file in enumerate(pdf_files, 1):
-        pdf_path = os.path.join(pdf_directory, pdf_file)
-        print(f"处理第 {i}/{len(pdf_files)} 个文件: {pdf_file}")
-        
-        try:
-            success = processor.process_pdf_to_excel(
-                pdf_path=pdf_path,
-                template_excel_path=template_excel_path,
-                output_dir=output_dir
-            )
-            
-            if success:
-                success_count += 1
-                print(f"✓ {pdf_file} 处理成功")
-            else:
-                print(f"✗ {pdf_file} 处理失败")
-        
-        except Exception as e:
-            print(f"✗ {pdf_file} 处理出错: {str(e)}")
+    # 多个文件在子进程中并行处理，按完成顺序输出结果
+    for i, (pdf_path, success, error) in enumerate(
+            process_pdfs_in_parallel(pdf_paths, template_excel_path, output_dir), 1):
+        pdf_file = os.path.basename(pdf_path)
+        if error is not None:
+            print(f"✗ [{i}/{len(pdf_files)}] {pdf_file} 处理出错: {str(error)}")
+        elif success:
+            success_count += 1
+            print(f"✓ [{i}/{len(pdf_files)}] {pdf_file} 处理成功")
+        else:
+            print(f"✗ [{i}/{len(pdf_files)}] {pdf_file} 处理失败")
     
     print(f"批量处理完成！成功: {success_count}/{len(pdf_files)}")
     return success_count
@@ -1179,11 +1910,11 @@ def main():
     
     # GUI模式
     if args.gui:
-        if not GUI_AVAILABLE:
+        if not _gui_available():
             print("错误: GUI功能不可用，请安装tkinter库")
             sys.exit(1)
         
-        root = tk.Tk()
+        root = _get_tk().Tk()
         app = PDFProcessorGUI(root)
         
         # 居中显示窗口
@@ -1254,4 +1985,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的可执行文件中启动多进程子进程时需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -121,7 +121,13 @@ excludes = [
     'test',
     'tkinter.test',
     'lib2to3',
-    'pydoc_data'
+    'pydoc_data',
+    # 程序运行时用不到的子包，排除后依赖分析和二进制扫描的范围更小
+    'numpy.distutils',
+    'numpy.f2py',
+    'onnxruntime.training',
+    'onnxruntime.quantization',
+    'onnxruntime.transformers'
 ]
 
 # Windows特定的二进制文件
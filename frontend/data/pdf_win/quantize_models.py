@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR模型INT8量化脚本
+将RapidOCR的检测和识别模型动态量化为INT8，结果保存为同目录下的*.int8.onnx；
+pdf_processor_complete.py检测到量化模型时优先使用，删除*.int8.onnx即恢复原模型
+需要在打包前运行一次，量化后请用test_ocr.py确认识别结果
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 只量化计算量大的检测和识别模型，方向分类模型很小，量化收益不明显
+QUANTIZE_KEYS = ('det', 'rec')
+
+
+def main():
+    try:
+        import rapidocr_onnxruntime
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+    except ImportError as e:
+        print(f"✗ 缺少依赖: {e}")
+        print("请安装: pip install rapidocr-onnxruntime onnx onnxruntime")
+        return 1
+
+    models_path = Path(rapidocr_onnxruntime.__file__).parent / 'models'
+    if not models_path.exists():
+        print(f"✗ 模型目录不存在: {models_path}")
+        return 1
+
+    with os.scandir(models_path) as it:
+        model_files = [entry.path for entry in it
+                       if entry.name.endswith('.onnx') and not entry.name.endswith('.int8.onnx')]
+
+    count = 0
+    for model_file in model_files:
+        name = os.path.basename(model_file)
+        if not any(key in name for key in QUANTIZE_KEYS):
+            continue
+        output_file = model_file[:-len('.onnx')] + '.int8.onnx'
+        print(f"量化: {name} -> {os.path.basename(output_file)}")
+        quantize_dynamic(model_file, output_file, weight_type=QuantType.QInt8)
+        size_mb = os.path.getsize(output_file) / (1024 * 1024)
+        print(f"  ✓ 完成 ({size_mb:.1f}MB)")
+        count += 1
+
+    print(f"共量化 {count} 个模型")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,18 @@ OCR功能测试脚本
 
 import sys
 import os
+import functools
 from pathlib import Path
 
+
+@functools.lru_cache(maxsize=4)
+def get_ocr(lang=None):
+    """按语言缓存RapidOCR实例，每种配置只加载一次模型，各项测试共用"""
+    from rapidocr_onnxruntime import RapidOCR
+    if lang is None:
+        return RapidOCR()
+    return RapidOCR(lang=lang)
+
 def test_ocr_import():
     """测试OCR模块导入"""
     print("=== 测试OCR模块导入 ===")
@@ -22,11 +32,15 @@ def test_ocr_import():
         models_path = rapidocr_path / 'models'
         
         if models_path.exists():
-            model_files = list(models_path.glob('*.onnx'))
+            # 文件名和大小直接取自目录项，不再逐个stat
+            with os.scandir(models_path) as it:
+                model_files = [entry for entry in it if entry.name.endswith('.onnx') and entry.is_file()]
             print(f"✓ 找到模型文件 {len(model_files)} 个:")
             for model in model_files:
                 size_mb = model.stat().st_size / (1024 * 1024)
                 print(f"  - {model.name} ({size_mb:.1f}MB)")
+            if any(model.name.endswith('.int8.onnx') for model in model_files):
+                print("✓ 存在INT8量化模型，处理时优先使用")
         else:
             print("⚠ 模型目录不存在")
             
@@ -41,16 +55,14 @@ def test_ocr_initialization():
     print("\n=== 测试OCR初始化 ===")
     
     try:
-        from rapidocr_onnxruntime import RapidOCR
-        
         # 测试默认初始化
         print("尝试默认初始化...")
-        ocr = RapidOCR()
+        ocr = get_ocr()
         print("✓ OCR默认初始化成功")
         
         # 测试带参数初始化
         print("尝试带参数初始化...")
-        ocr_ch = RapidOCR(lang='ch')
+        ocr_ch = get_ocr('ch')
         print("✓ OCR中文初始化成功")
         
         return True
@@ -64,9 +76,8 @@ def test_ocr_recognition():
     print("\n=== 测试OCR识别功能 ===")
     
     try:
-        from rapidocr_onnxruntime import RapidOCR
         from PIL import Image, ImageDraw, ImageFont
-        import io
+        import numpy as np
         
         # 创建测试图片
         img = Image.new('RGB', (200, 100), color='white')
@@ -82,14 +93,12 @@ def test_ocr_recognition():
         draw.text((10, 30), "Hello World", fill='black', font=font)
         draw.text((10, 60), "测试文字", fill='black', font=font)
         
-        # 转换为字节
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='PNG')
-        img_bytes = img_bytes.getvalue()
+        # 直接转换为RapidOCR使用的BGR数组，不经过PNG编码和解码
+        img_array = np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
         
-        # OCR识别
-        ocr = RapidOCR()
-        result, _ = ocr(img_bytes)
+        # OCR识别，复用初始化测试中加载的实例
+        ocr = get_ocr()
+        result, _ = ocr(img_array)
         
         if result:
             print("✓ OCR识别成功，识别结果:")